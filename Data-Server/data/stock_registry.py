@@ -1,88 +1,230 @@
 """Stock registry — dynamically loads real NEPSE data from the Data directory.
 
 Reads company metadata from company_list.csv and price history from
-individual CSV files in Data/price_history/.
+individual CSV files in Data/price_history/. When pyarrow is installed, parsed
+price histories are cached as Parquet files in Data/price_history_parquet/ so
+later loads skip CSV parsing.
 """
 
 import csv
 import logging
 import os
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    PARQUET_ENABLED = True
+except ImportError:
+    PARQUET_ENABLED = False
+
 logger = logging.getLogger(__name__)
 
 # Path to the real Data directory (sibling to Data-Server)
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 _DATA_DIR = os.path.join(_PROJECT_ROOT, "Data")
 _PRICE_HISTORY_DIR = os.path.join(_DATA_DIR, "price_history")
+_PARQUET_DIR = os.path.join(_DATA_DIR, "price_history_parquet")
+_PRELOAD_WORKERS = 8
+_ACCESSOR_CACHE_SIZE = 4096  # (symbol, days) entries kept per memoized accessor
 _COMPANY_LIST_PATH = os.path.join(_DATA_DIR, "company_list.csv")
 
 # In-memory caches
-_company_registry: Dict[str, dict] = {}
+# Company metadata: one row per symbol (symbol, name, sector, ltp), with
+# category dtype for the repetitive string columns
+_company_df: pd.DataFrame = pd.DataFrame(columns=["symbol", "name", "sector", "ltp"])
+_company_index: Dict[str, int] = {}  # symbol -> row position in _company_df
+# Backing arrays of _company_df for O(1) row reads: (names, sector codes,
+# sector categories, ltps)
+_company_columns: tuple = ((), (), (), ())
 _price_cache: Dict[str, pd.DataFrame] = {}
+# Column arrays of the cached frames (chronological), for numeric helpers
+_price_arrays: Dict[str, Dict[str, np.ndarray]] = {}
+_price_files_cache: Optional[Dict[str, str]] = None
+# (symbols, upper-case names, result dicts, lower-case sector -> row positions)
+_search_index: Optional[tuple] = None
+# Known symbol in upper and lower case -> canonical (upper-case) symbol
+_canonical_symbols: Optional[Dict[str, str]] = None
 _initialized = False
-
-
-def _parse_number(value: str) -> float:
-    """Parse a number string that may contain commas (e.g., '1,129.80')."""
-    if not value or value == "-":
-        return 0.0
-    try:
-        return float(str(value).replace(",", "").strip())
-    except (ValueError, TypeError):
-        return 0.0
+# Serializes loading; readers wait on it until the first load has finished
+_init_lock = threading.Lock()
+
+# Price history CSV column -> parsed column (Ltp = Last Traded Price)
+_PRICE_COLUMNS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Ltp": "close",
+    "Qty": "volume",
+    "Turnover": "turnover",
+    "% Change": "change_pct",
+}
+_FRAME_COLUMNS = ["date", *_PRICE_COLUMNS.values()]
+
+
+def _first_column(df: pd.DataFrame, *names: str) -> pd.Series:
+    """Return the first of ``names`` present in ``df`` (empty strings if none)."""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series("", index=df.index)
+
+
+def _parse_number_column(column: pd.Series) -> pd.Series:
+    """Parse a column of number strings that may contain commas (e.g., '1,129.80').
+
+    Blank, '-' and unparseable cells become 0.0.
+    """
+    cleaned = column.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned.replace("-", "0"), errors="coerce").fillna(0.0)
 
 
 def _load_company_list():
     """Load company metadata from company_list.csv."""
-    global _company_registry
+    global _company_df, _company_index, _company_columns
     if not os.path.exists(_COMPANY_LIST_PATH):
         logger.warning(f"Company list not found: {_COMPANY_LIST_PATH}")
         return
 
     try:
-        df = pd.read_csv(_COMPANY_LIST_PATH)
-        for _, row in df.iterrows():
-            symbol = str(row.get("symbol", row.get("Symbol", ""))).strip().upper()
-            if not symbol:
-                continue
-            _company_registry[symbol] = {
-                "symbol": symbol,
-                "name": str(row.get("Company", row.get("Company_text", ""))).strip(),
-                "sector": str(row.get("sector", "")).strip(),
-                "ltp": _parse_number(str(row.get("LTP", "0"))),
-            }
-        logger.info(f"Loaded {len(_company_registry)} companies from company_list.csv")
+        raw = pd.read_csv(_COMPANY_LIST_PATH)
+        df = pd.DataFrame({
+            "symbol": _first_column(raw, "symbol", "Symbol")
+            .fillna("").astype(str).str.strip().str.upper(),
+            "name": _first_column(raw, "Company", "Company_text").fillna("").astype(str).str.strip(),
+            "sector": _first_column(raw, "sector").fillna("").astype(str).str.strip(),
+            "ltp": _parse_number_column(_first_column(raw, "LTP")),
+        })
+        df = df[df["symbol"] != ""].drop_duplicates("symbol", keep="last")
+        df = df.reset_index(drop=True)
+        df["symbol"] = df["symbol"].astype("category")
+        df["sector"] = df["sector"].astype("category")
+
+        _company_df = df
+        _company_index = {symbol: i for i, symbol in enumerate(df["symbol"])}
+        _company_columns = (
+            df["name"].to_numpy(dtype=object),
+            df["sector"].cat.codes.to_numpy(),
+            list(df["sector"].cat.categories),
+            df["ltp"].to_numpy(dtype=np.float64),
+        )
+        logger.info(f"Loaded {len(_company_df)} companies from company_list.csv")
     except Exception as e:
         logger.error(f"Error loading company list: {e}")
 
 
+def _company_info(symbol: str) -> Optional[dict]:
+    """Return the company_list.csv metadata for an upper-case symbol."""
+    row = _company_index.get(symbol)
+    if row is None:
+        return None
+    names, sector_codes, sectors, ltps = _company_columns
+    return {
+        "symbol": symbol,
+        "name": names[row],
+        "sector": sectors[sector_codes[row]],
+        "ltp": float(ltps[row]),
+    }
+
+
 def _initialize():
-    """Initialize the registry by loading company data."""
-    global _initialized
+    """Initialize the registry by loading company data and all price histories.
+
+    Callers arriving while another thread is loading block until the load
+    completes, so nothing is read (or memoized) from a half-built registry.
+    """
     if _initialized:
         return
+    with _init_lock:
+        if not _initialized:
+            _load_registry()
+
+
+def _load_registry():
+    """Load company data and price histories; the caller holds _init_lock."""
+    global _initialized
     _load_company_list()
+    _preload_price_histories()
     _initialized = True
 
 
+def _preload_price_histories():
+    """Load every price history into the cache in parallel.
+
+    Keeps the first tick-path lookup of each symbol from blocking on disk;
+    total cost is bounded by the slowest reads rather than their sum.
+    """
+    files = _get_available_price_files()
+    with ThreadPoolExecutor(max_workers=_PRELOAD_WORKERS) as pool:
+        loaded = sum(pool.map(_preload_symbol, files.items()))
+    logger.info(f"Preloaded price history for {loaded}/{len(files)} symbols")
+
+
+def _preload_symbol(item) -> bool:
+    symbol, path = item
+    return _cache_price_frame(symbol, path) is not None
+
+
 def _get_available_price_files() -> Dict[str, str]:
-    """Scan the price_history directory for available CSV files."""
+    """Return symbol -> CSV path for the price_history directory.
+
+    The directory is scanned once; call refresh_registry() to rescan.
+    """
+    global _price_files_cache
+    if _price_files_cache is not None:
+        return _price_files_cache
+
     files = {}
     if not os.path.exists(_PRICE_HISTORY_DIR):
         logger.warning(f"Price history directory not found: {_PRICE_HISTORY_DIR}")
         return files
 
-    for filename in os.listdir(_PRICE_HISTORY_DIR):
-        if filename.endswith("_price_history.csv"):
-            # Extract symbol from filename: nabil_price_history.csv -> NABIL
-            symbol = filename.replace("_price_history.csv", "").upper()
-            files[symbol] = os.path.join(_PRICE_HISTORY_DIR, filename)
+    suffix = "_price_history.csv"
+    with os.scandir(_PRICE_HISTORY_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix):
+                # Extract symbol from filename: nabil_price_history.csv -> NABIL
+                files[entry.name[: -len(suffix)].upper()] = entry.path
+    _price_files_cache = files
     return files
 
 
+def refresh_registry():
+    """Drop all cached registry data and reload it from the Data directory."""
+    global _initialized
+    with _init_lock:
+        _initialized = False
+        _clear_registry()
+        _load_registry()
+
+
+def _clear_registry():
+    """Reset every cache and memoized accessor to the unloaded state."""
+    global _price_files_cache, _company_df, _company_index, _company_columns
+    global _search_index, _canonical_symbols
+    _company_df = _company_df.iloc[0:0]
+    _company_index = {}
+    _company_columns = ((), (), (), ())
+    _price_cache.clear()
+    _price_arrays.clear()
+    _price_files_cache = None
+    _search_index = None
+    _sector_rows.cache_clear()
+    _canonical_symbols = None
+    _stock_info.cache_clear()
+    _historical_records.cache_clear()
+    _historical_columns.cache_clear()
+    get_average_volume.cache_clear()
+    get_volatility.cache_clear()
+
+
 def get_all_symbols() -> List[str]:
     """Return list of all stock symbols that have price history data."""
     _initialize()
@@ -106,14 +248,50 @@ def get_tracked_symbols() -> List[str]:
     return [s for s in default_stocks if s in available]
 
 
+def canonical_symbol(symbol: str) -> Optional[str]:
+    """Return the registered upper-case form of symbol, or None if it is unknown.
+
+    Exact and lower-case spellings resolve with one dict lookup; only
+    mixed-case input pays for an upper() call.
+    """
+    global _canonical_symbols
+    if _canonical_symbols is None:
+        _initialize()
+        known = set(_company_index) | set(_get_available_price_files())
+        _canonical_symbols = {s: s for s in known}
+        _canonical_symbols.update({s.lower(): s for s in known})
+    return _canonical_symbols.get(symbol) or _canonical_symbols.get(symbol.upper())
+
+
 def get_stock_info(symbol: str) -> Optional[dict]:
     """Return metadata for a stock symbol."""
     _initialize()
-    symbol = symbol.upper()
+    info = _stock_info(symbol.upper())
+    return dict(info) if info is not None else None
+
+
+def get_stock_infos(symbols: Iterable[str]) -> Dict[str, dict]:
+    """Return metadata for many symbols at once, skipping unknown ones.
 
+    The info dicts are cached and shared between calls, so treat them as
+    read-only.
+    """
+    _initialize()
+    infos = {}
+    for symbol in symbols:
+        info = _stock_info(symbol.upper())
+        if info is not None:
+            infos[symbol] = info
+    return infos
+
+
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
+def _stock_info(symbol: str) -> Optional[dict]:
+    """Memoized metadata lookup for an upper-case symbol."""
     # Try company registry first
-    if symbol in _company_registry:
-        return _company_registry[symbol]
+    info = _company_info(symbol)
+    if info is not None:
+        return info
 
     # Fall back to price file inspection
     files = _get_available_price_files()
@@ -132,10 +310,170 @@ def get_stock_info(symbol: str) -> Optional[dict]:
         return {"symbol": symbol, "name": symbol, "sector": "Unknown"}
 
 
+def _get_search_index() -> tuple:
+    """Build (once) the parallel search columns over every symbol with price data."""
+    global _search_index
+    if _search_index is None:
+        symbols = tuple(get_all_symbols())
+        infos = [_stock_info(symbol) or {} for symbol in symbols]
+        by_sector: Dict[str, List[int]] = {}
+        for i, info in enumerate(infos):
+            by_sector.setdefault(info.get("sector", "").lower(), []).append(i)
+        _search_index = (
+            symbols,
+            tuple(info.get("name", "").upper() for info in infos),
+            # Ready-made search results, one per symbol
+            tuple(
+                {
+                    "symbol": symbol,
+                    "name": info.get("name", symbol),
+                    "sector": info.get("sector", ""),
+                }
+                for symbol, info in zip(symbols, infos)
+            ),
+            by_sector,
+        )
+    return _search_index
+
+
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
+def _sector_rows(sector: str) -> tuple:
+    """Index rows, in symbol order, whose lower-case sector contains ``sector``."""
+    _, _, _, by_sector = _get_search_index()
+    return tuple(sorted(i for key, rows in by_sector.items() if sector in key for i in rows))
+
+
+def search_stocks(query: str = "", sector: str = "", limit: int = 50) -> List[dict]:
+    """Find stocks whose symbol or name contains query, optionally within a sector.
+
+    Both filters are case-insensitive substring matches; results keep
+    symbol order and stop at limit. The result dicts are shared between
+    calls, so treat them as read-only.
+    """
+    _initialize()
+    symbols, names_upper, records, _ = _get_search_index()
+    query = query.strip().upper()
+    sector = sector.strip().lower()
+    candidates = _sector_rows(sector) if sector else range(len(symbols))
+
+    if not query:
+        # Sector-only (or no) filter: the answer is a prefix of the candidates
+        return [records[i] for i in candidates[:limit]]
+
+    results = []
+    for i in candidates:
+        if query in symbols[i] or query in names_upper[i]:
+            results.append(records[i])
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _read_price_csv(path: str) -> pd.DataFrame:
+    """Read a price history CSV and parse it into typed, chronological columns.
+
+    CSV is in descending order (newest first); the returned frame is
+    oldest first with columns: date, open, high, low, close, volume,
+    turnover, change_pct.
+    """
+    raw = pd.read_csv(
+        path,
+        thousands=",",
+        usecols=lambda name: name == "Date" or name in _PRICE_COLUMNS,
+    )
+    df = pd.DataFrame({"date": _first_column(raw, "Date").fillna("").astype(str)})
+    for source, column in _PRICE_COLUMNS.items():
+        values = _first_column(raw, source)
+        if pd.api.types.is_numeric_dtype(values):
+            df[column] = values.astype(np.float64).fillna(0.0)
+        else:
+            # Fall back to string cleanup for cells like '-'
+            df[column] = _parse_number_column(values)
+    df["volume"] = df["volume"].astype("int64")
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def _load_price_frame(symbol: str, csv_path: str) -> pd.DataFrame:
+    """Load a parsed price history, preferring an up-to-date Parquet copy.
+
+    Without pyarrow this is just _read_price_csv(). With it, the parsed CSV
+    is written to Data/price_history_parquet/{symbol}.parquet and read back
+    from there until the CSV changes.
+    """
+    if not PARQUET_ENABLED:
+        return _read_price_csv(csv_path)
+
+    parquet_path = os.path.join(_PARQUET_DIR, f"{symbol.lower()}.parquet")
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            return pq.read_table(parquet_path, columns=_FRAME_COLUMNS).to_pandas()
+    except OSError:
+        pass  # no cached copy yet
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable Parquet cache for {symbol}: {e}")
+
+    df = _read_price_csv(csv_path)
+    try:
+        os.makedirs(_PARQUET_DIR, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), parquet_path)
+    except Exception as e:
+        logger.warning(f"Could not write Parquet cache for {symbol}: {e}")
+    return df
+
+
+def _cache_price_frame(symbol: str, path: str) -> Optional[pd.DataFrame]:
+    """Load a symbol's price history and store it (and its arrays) in the cache."""
+    try:
+        df = _load_price_frame(symbol, path)
+    except Exception as e:
+        logger.error(f"Error loading price history for {symbol}: {e}")
+        return None
+
+    _price_arrays[symbol] = {
+        "date": df["date"].to_numpy(),
+        "close": df["close"].to_numpy(dtype=np.float64),
+        "volume": df["volume"].to_numpy(dtype=np.int64),
+    }
+    _price_cache[symbol] = df
+    return df
+
+
+def _get_price_frame(symbol: str) -> Optional[pd.DataFrame]:
+    """Return the cached, parsed price history frame for a symbol."""
+    _initialize()
+    symbol = symbol.upper()
+
+    # Check cache (normally warm after _initialize)
+    if symbol not in _price_cache:
+        files = _get_available_price_files()
+        if symbol not in files:
+            return None
+        return _cache_price_frame(symbol, files[symbol])
+
+    return _price_cache[symbol]
+
+
+def _get_price_arrays(symbol: str) -> Optional[Dict[str, np.ndarray]]:
+    """Return the cached column arrays (date, close, volume) for a symbol."""
+    if _get_price_frame(symbol) is None:
+        return None
+    return _price_arrays[symbol.upper()]
+
+
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
+def _historical_records(symbol: str, days: int) -> tuple:
+    """Memoized records for get_historical_data, keyed on (symbol, days)."""
+    df = _get_price_frame(symbol)
+    if df is None:
+        return ()
+    return tuple((df.tail(days) if days else df).to_dict("records"))
+
+
 def get_historical_data(symbol: str, days: int = 50) -> List[dict]:
     """Load historical OHLCV data from CSV file.
 
-    Returns data in chronological order (oldest first).
+    Returns data in chronological order (oldest first). The record dicts
+    are cached and shared between calls, so treat them as read-only.
 
     Args:
         symbol: Stock symbol (case-insensitive)
@@ -144,43 +482,25 @@ def get_historical_data(symbol: str, days: int = 50) -> List[dict]:
     Returns:
         List of dicts with keys: date, open, high, low, close, volume, turnover
     """
-    symbol = symbol.upper()
+    return list(_historical_records(symbol.upper(), days))
 
-    # Check cache
-    if symbol not in _price_cache:
-        files = _get_available_price_files()
-        if symbol not in files:
-            return []
-
-        try:
-            df = pd.read_csv(files[symbol])
-            _price_cache[symbol] = df
-        except Exception as e:
-            logger.error(f"Error loading price history for {symbol}: {e}")
-            return []
-
-    df = _price_cache[symbol]
-
-    # Parse the data — CSV is in descending order (newest first)
-    records = []
-    for _, row in df.iterrows():
-        try:
-            records.append({
-                "date": str(row.get("Date", "")),
-                "open": _parse_number(str(row.get("Open", 0))),
-                "high": _parse_number(str(row.get("High", 0))),
-                "low": _parse_number(str(row.get("Low", 0))),
-                "close": _parse_number(str(row.get("Ltp", 0))),  # Ltp = Last Traded Price
-                "volume": int(_parse_number(str(row.get("Qty", 0)))),
-                "turnover": _parse_number(str(row.get("Turnover", 0))),
-                "change_pct": _parse_number(str(row.get("% Change", 0))),
-            })
-        except Exception:
-            continue
-
-    # Reverse to chronological order (oldest first) and take last N days
-    records.reverse()
-    return records[-days:] if days else records
+
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
+def _historical_columns(symbol: str, days: int) -> Dict[str, list]:
+    """Memoized columns for get_historical_columns, keyed on (symbol, days)."""
+    df = _get_price_frame(symbol)
+    if df is None:
+        return {}
+    return (df.tail(days) if days else df).to_dict("list")
+
+
+def get_historical_columns(symbol: str, days: int = 50) -> Dict[str, list]:
+    """Column-oriented get_historical_data: one list per field, oldest first.
+
+    The lists are cached and shared between calls, so treat them as
+    read-only.
+    """
+    return dict(_historical_columns(symbol.upper(), days))
 
 
 def get_latest_close(symbol: str) -> Optional[float]:
@@ -191,33 +511,34 @@ def get_latest_close(symbol: str) -> Optional[float]:
 
     # Fall back to company list LTP
     _initialize()
-    info = _company_registry.get(symbol.upper())
+    info = _company_info(symbol.upper())
     return info["ltp"] if info and info.get("ltp") else None
 
 
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
 def get_average_volume(symbol: str, days: int = 20) -> Optional[float]:
     """Get average trading volume over the last N days."""
-    history = get_historical_data(symbol, days=days)
-    if not history:
+    arrays = _get_price_arrays(symbol)
+    if arrays is None:
         return None
-    volumes = [d["volume"] for d in history if d["volume"] > 0]
-    return sum(volumes) / len(volumes) if volumes else None
+    volumes = arrays["volume"][-days:]
+    volumes = volumes[volumes > 0]
+    return float(volumes.mean()) if volumes.size else None
 
 
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
 def get_volatility(symbol: str, days: int = 20) -> float:
     """Calculate historical volatility (std dev of daily returns)."""
-    history = get_historical_data(symbol, days=days + 1)
-    if len(history) < 2:
+    arrays = _get_price_arrays(symbol)
+    closes = arrays["close"][-(days + 1):] if arrays is not None else ()
+    if len(closes) < 2:
         return 0.02  # default volatility
 
-    returns = []
-    for i in range(1, len(history)):
-        if history[i - 1]["close"] > 0:
-            r = (history[i]["close"] - history[i - 1]["close"]) / history[i - 1]["close"]
-            returns.append(r)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(closes) / closes[:-1]
+    returns = returns[np.isfinite(returns)]
 
-    if not returns:
+    if not returns.size:
         return 0.02
 
-    import numpy as np
-    return float(np.std(returns))
+    return float(returns.std())
@@ -6,13 +6,24 @@ frontend can guide users after creating/checking alerts.
 """
 
 from dataclasses import dataclass, field
-import math
 from typing import Dict, List, Optional
 
+import numpy as np
+import pandas as pd
+
 from detection.spike_detector import SpikeDetector
 
+_FEATURE_COLUMNS = (
+    "change_pct",
+    "volume_ratio",
+    "intraday_momentum_pct",
+    "price_signal",
+    "volume_signal",
+    "momentum_signal",
+)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AlertRecommendation:
     """Advisory output for a symbol at the current tick."""
 
@@ -47,27 +58,11 @@ class AlertAdvisor:
         self._w_volume = 0.25
         self._w_momentum = 0.15
 
-    @staticmethod
-    def _clamp(value: float, min_value: float, max_value: float) -> float:
-        return max(min_value, min(max_value, value))
-
-    @staticmethod
-    def _sigmoid(value: float) -> float:
-        return 1.0 / (1.0 + math.exp(-value))
-
-    def recommend(
+    def _thresholds(
         self,
-        tick: dict,
-        price_threshold_pct: Optional[float] = None,
-        volume_threshold_multiplier: Optional[float] = None,
-    ) -> AlertRecommendation:
-        symbol = str(tick.get("symbol", "")).upper()
-        price = float(tick.get("price", 0) or 0)
-        prev_close = float(tick.get("prev_close", 0) or 0)
-        day_open = float(tick.get("open", prev_close) or 0)
-        volume = float(tick.get("volume", 0) or 0)
-        avg_volume = float(tick.get("avg_volume", 0) or 0)
-
+        price_threshold_pct: Optional[float],
+        volume_threshold_multiplier: Optional[float],
+    ) -> tuple:
         price_threshold = (
             float(price_threshold_pct)
             if price_threshold_pct is not None
@@ -78,29 +73,87 @@ class AlertAdvisor:
             if volume_threshold_multiplier is not None
             else float(self.detector.default_volume_threshold_multiplier)
         )
+        return price_threshold, volume_threshold
 
-        change_pct = (
-            float(tick.get("change_pct"))
-            if tick.get("change_pct") is not None
-            else (((price - prev_close) / prev_close) * 100.0 if prev_close > 0 else 0.0)
+    def recommend_batch(
+        self,
+        df: pd.DataFrame,
+        price_threshold_pct: Optional[float] = None,
+        volume_threshold_multiplier: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """Score every row of a tick frame in one vectorized pass.
+
+        Args:
+            df: Frame with columns symbol, price, prev_close and optionally
+                open, volume, avg_volume, change_pct (NaN = derive from prices)
+            price_threshold_pct: Custom price threshold
+            volume_threshold_multiplier: Custom volume threshold
+
+        Returns:
+            Frame with columns symbol, action, confidence, risk_level, score
+            and the feature columns used by AlertRecommendation.features
+        """
+        n = len(df)
+
+        def column(name: str, default) -> np.ndarray:
+            if name not in df:
+                return np.full(n, default, dtype=np.float64)
+            return df[name].to_numpy(dtype=np.float64)
+
+        prev_close = column("prev_close", 0.0)
+        scored = self._score(
+            price=column("price", 0.0),
+            prev_close=prev_close,
+            day_open=df["open"].to_numpy(dtype=np.float64) if "open" in df else prev_close,
+            volume=column("volume", 0.0),
+            avg_volume=column("avg_volume", 0.0),
+            given_change=column("change_pct", np.nan),
+            thresholds=self._thresholds(price_threshold_pct, volume_threshold_multiplier),
         )
-        volume_ratio = (volume / avg_volume) if avg_volume > 0 else 1.0
-        intraday_momentum = ((price - day_open) / day_open) * 100.0 if day_open > 0 else 0.0
 
-        normalized_price = self._clamp(
-            change_pct / max(price_threshold, 0.1),
-            -2.0,
-            2.0,
+        symbols = df["symbol"] if "symbol" in df else pd.Series("", index=df.index)
+        return pd.DataFrame(
+            {"symbol": symbols.astype(str).str.upper().to_numpy(), **scored},
+            index=df.index,
         )
-        normalized_volume = self._clamp(
-            (volume_ratio - 1.0) / max(volume_threshold - 1.0, 0.25),
-            -1.0,
-            2.0,
+
+    def _score(
+        self,
+        price: np.ndarray,
+        prev_close: np.ndarray,
+        day_open: np.ndarray,
+        volume: np.ndarray,
+        avg_volume: np.ndarray,
+        given_change: np.ndarray,
+        thresholds: tuple,
+    ) -> Dict[str, np.ndarray]:
+        """Score equal-length float arrays of tick values (length 1 for one tick).
+
+        given_change is NaN where change_pct should be derived from prices.
+        Returns action, confidence, risk_level, score and the feature
+        columns, each as an array aligned with the inputs.
+        """
+        price_threshold, volume_threshold = thresholds
+        n = price.shape[0]
+
+        # Divide only where the denominator is positive; other rows keep
+        # the fallback the output array was initialized with.
+        derived_change = np.zeros(n)
+        np.divide(price - prev_close, prev_close, out=derived_change, where=prev_close > 0)
+        derived_change *= 100.0
+        volume_ratio = np.ones(n)
+        np.divide(volume, avg_volume, out=volume_ratio, where=avg_volume > 0)
+        intraday_momentum = np.zeros(n)
+        np.divide(price - day_open, day_open, out=intraday_momentum, where=day_open > 0)
+        intraday_momentum *= 100.0
+        change_pct = np.where(np.isnan(given_change), derived_change, given_change)
+
+        normalized_price = np.clip(change_pct / max(price_threshold, 0.1), -2.0, 2.0)
+        normalized_volume = np.clip(
+            (volume_ratio - 1.0) / max(volume_threshold - 1.0, 0.25), -1.0, 2.0
         )
-        normalized_momentum = self._clamp(
-            intraday_momentum / max(price_threshold, 0.1),
-            -2.0,
-            2.0,
+        normalized_momentum = np.clip(
+            intraday_momentum / max(price_threshold, 0.1), -2.0, 2.0
         )
 
         score = (
@@ -108,23 +161,62 @@ class AlertAdvisor:
             + normalized_volume * self._w_volume
             + normalized_momentum * self._w_momentum
         )
-        confidence = self._sigmoid(abs(score) * 2.0)
-
-        if score >= 0.75:
-            action = "buy"
-        elif score <= -0.75:
-            action = "sell"
-        elif abs(score) >= 0.35:
-            action = "watch"
-        else:
-            action = "hold"
-
-        if abs(change_pct) >= price_threshold * 1.8 or volume_ratio >= volume_threshold * 1.8:
-            risk_level = "high"
-        elif abs(change_pct) >= price_threshold or volume_ratio >= volume_threshold:
-            risk_level = "medium"
-        else:
-            risk_level = "low"
+        # Algebraic sigmoid x / (1 + |x|): monotone, bounded in [0.5, 1) for
+        # x >= 0 and needs no exp(); confidence is only used for display.
+        strength = np.abs(score) * 2.0
+        confidence = 0.5 * (1.0 + strength / (1.0 + strength))
+
+        action = np.select(
+            [score >= 0.75, score <= -0.75, np.abs(score) >= 0.35],
+            ["buy", "sell", "watch"],
+            default="hold",
+        )
+        abs_change = np.abs(change_pct)
+        risk_level = np.select(
+            [
+                (abs_change >= price_threshold * 1.8) | (volume_ratio >= volume_threshold * 1.8),
+                (abs_change >= price_threshold) | (volume_ratio >= volume_threshold),
+            ],
+            ["high", "medium"],
+            default="low",
+        )
+
+        return {
+            "action": action,
+            "confidence": confidence,
+            "risk_level": risk_level,
+            "score": score,
+            "change_pct": change_pct,
+            "volume_ratio": volume_ratio,
+            "intraday_momentum_pct": intraday_momentum,
+            "price_signal": normalized_price,
+            "volume_signal": normalized_volume,
+            "momentum_signal": normalized_momentum,
+        }
+
+    def recommend(
+        self,
+        tick: dict,
+        price_threshold_pct: Optional[float] = None,
+        volume_threshold_multiplier: Optional[float] = None,
+    ) -> AlertRecommendation:
+        prev_close = float(tick.get("prev_close", 0) or 0)
+        change_pct = tick.get("change_pct")
+        price_threshold, volume_threshold = thresholds = self._thresholds(
+            price_threshold_pct, volume_threshold_multiplier
+        )
+        scored = self._score(
+            price=np.array([float(tick.get("price", 0) or 0)]),
+            prev_close=np.array([prev_close]),
+            day_open=np.array([float(tick.get("open", prev_close) or 0)]),
+            volume=np.array([float(tick.get("volume", 0) or 0)]),
+            avg_volume=np.array([float(tick.get("avg_volume", 0) or 0)]),
+            given_change=np.array([float(change_pct) if change_pct is not None else np.nan]),
+            thresholds=thresholds,
+        )
+        result = {name: values[0].item() for name, values in scored.items()}
+        change_pct = result["change_pct"]
+        volume_ratio = result["volume_ratio"]
 
         reasons: List[str] = []
         if abs(change_pct) >= price_threshold:
@@ -140,19 +232,11 @@ class AlertAdvisor:
             reasons.append("No strong spike signal yet; monitor before taking action.")
 
         return AlertRecommendation(
-            symbol=symbol,
-            action=action,
-            confidence=confidence,
-            risk_level=risk_level,
-            score=score,
+            symbol=str(tick.get("symbol", "")).upper(),
+            action=result["action"],
+            confidence=result["confidence"],
+            risk_level=result["risk_level"],
+            score=result["score"],
             reasons=reasons,
-            features={
-                "change_pct": change_pct,
-                "volume_ratio": volume_ratio,
-                "intraday_momentum_pct": intraday_momentum,
-                "price_signal": normalized_price,
-                "volume_signal": normalized_volume,
-                "momentum_signal": normalized_momentum,
-            },
+            features={name: result[name] for name in _FEATURE_COLUMNS},
         )
-
@@ -5,19 +5,55 @@ emits triggered alerts with cooldown deduplication.
 """
 
 import logging
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from config import Config
 from detection.spike_detector import SpikeAlert, SpikeDetector
+from utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+class AlertType(IntEnum):
+    """Alert kinds, used as row indices into the cooldown matrix."""
+
+    PRICE = 0
+    VOLUME = 1
+
+
+@njit(cache=True)
+def _detect_spikes(price, prev_close, volume, avg_volume, price_thr, vol_thr):
+    """Threshold checks for subscription rows, with tick values gathered per row.
+
+    Same cross-multiplied comparisons as SpikeDetector, masked to positive
+    reference values. Returns a (len(AlertType), n) bool mask.
+    """
+    hits = np.empty((2, price.shape[0]), dtype=np.bool_)
+    hits[0] = (prev_close > 0) & (np.abs(price - prev_close) * 100.0 >= price_thr * prev_close)
+    hits[1] = (avg_volume > 0) & (volume >= vol_thr * avg_volume)
+    return hits
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    """Copy array into a new one with room for capacity entries on its last axis."""
+    grown = np.zeros(array.shape[:-1] + (capacity,), dtype=array.dtype)
+    grown[..., : array.shape[-1]] = array
+    return grown
+
+
+@dataclass(frozen=True)
 class AlertSubscription:
-    """A user's alert configuration for a specific stock."""
+    """A user's alert configuration for a specific stock.
+
+    Read-only: the manager screens its own table copy of the settings, so
+    changes go through add_subscription / set_subscription_enabled.
+    """
 
     user_id: str
     symbol: str
@@ -33,6 +69,15 @@ class AlertManager:
     - Per-user, per-symbol threshold configurations
     - Cooldown window to prevent duplicate alerts
     - Callback-based alert emission
+
+    Ticks are screened against all subscriptions at once using a
+    struct-of-arrays subscription table (rows appended on add and
+    swap-deleted on remove) plus a symbol -> rows index, so only
+    subscriptions for symbols in the batch are evaluated; only rows that
+    cross a threshold go through the scalar SpikeDetector.
+
+    Subscription changes arrive on socket handler threads while the engine
+    thread screens ticks, so the table is only touched under _lock.
     """
 
     def __init__(self, detector: Optional[SpikeDetector] = None):
@@ -41,15 +86,35 @@ class AlertManager:
             default_volume_threshold_multiplier=Config.DEFAULT_VOLUME_THRESHOLD_MULTIPLIER,
         )
         self._subscriptions: Dict[str, Dict[str, AlertSubscription]] = {}
-        # Cooldown tracking: (user_id, symbol, alert_type) -> last_alert_time
-        self._cooldowns: Dict[tuple, float] = {}
         self._cooldown_seconds = Config.ALERT_COOLDOWN_SECONDS
         self._alert_listeners: List[Callable] = []
+        # Guards _subscriptions and the subscription table below
+        self._lock = threading.Lock()
+
+        # Interned user ids: user_id -> small integer id, and back
+        self._user_ids: Dict[str, int] = {}
+        self._user_names: List[str] = []
+
+        # Subscription table: one row per subscription, arrays over-allocated
+        # so rows 0.._n_rows-1 are live
+        self._n_rows = 0
+        self._rows: Dict[Tuple[str, str], int] = {}  # (user_id, symbol) -> row
+        self._row_keys: List[Tuple[str, str]] = []  # row -> (user_id, symbol)
+        self._sub_user_ids = np.empty(0, dtype=np.int64)
+        self._sub_price_thr = np.empty(0, dtype=np.float64)
+        self._sub_vol_thr = np.empty(0, dtype=np.float64)
+        # Inverted index: symbol -> table rows subscribed to it
+        self._by_symbol: Dict[str, np.ndarray] = {}
+        # Cooldown tracking: last alert time, indexed [AlertType, table row]
+        self._cooldowns = np.zeros((len(AlertType), 0), dtype=np.float64)
+        # Cooldowns of removed subscriptions, restored if they are re-added
+        self._retired_cooldowns: Dict[Tuple[str, str], np.ndarray] = {}
 
-    def on_alert(self, callback: Callable[[str, SpikeAlert], None]):
+    def on_alert(self, callback: Callable[[List[Tuple[str, SpikeAlert]]], None]):
         """Register a callback for triggered alerts.
 
-        Callback receives (user_id, alert).
+        Callback is called once per tick batch that triggered anything and
+        receives a list of (user_id, alert) pairs.
         """
         self._alert_listeners.append(callback)
 
@@ -62,16 +127,20 @@ class AlertManager:
     ) -> AlertSubscription:
         """Add or update a user's alert subscription for a stock."""
         symbol = symbol.upper()
-        if user_id not in self._subscriptions:
-            self._subscriptions[user_id] = {}
-
         sub = AlertSubscription(
             user_id=user_id,
             symbol=symbol,
             price_threshold_pct=price_threshold_pct,
             volume_threshold_multiplier=volume_threshold_multiplier,
         )
-        self._subscriptions[user_id][symbol] = sub
+        with self._lock:
+            if user_id not in self._subscriptions:
+                self._subscriptions[user_id] = {}
+            if user_id not in self._user_ids:
+                self._user_ids[user_id] = len(self._user_names)
+                self._user_names.append(user_id)
+            self._subscriptions[user_id][symbol] = sub
+            self._set_row(sub)
         logger.info(
             f"Alert subscription added: user={user_id}, symbol={symbol}, "
             f"price={price_threshold_pct}%, volume={volume_threshold_multiplier}x"
@@ -81,15 +150,30 @@ class AlertManager:
     def remove_subscription(self, user_id: str, symbol: str) -> bool:
         """Remove a user's alert subscription for a stock."""
         symbol = symbol.upper()
-        if user_id in self._subscriptions and symbol in self._subscriptions[user_id]:
-            del self._subscriptions[user_id][symbol]
+        with self._lock:
+            if user_id in self._subscriptions and symbol in self._subscriptions[user_id]:
+                del self._subscriptions[user_id][symbol]
+                if (user_id, symbol) in self._rows:
+                    self._delete_row((user_id, symbol))
+                return True
+            return False
+
+    def set_subscription_enabled(self, user_id: str, symbol: str, enabled: bool) -> bool:
+        """Enable or disable a user's alert subscription without removing it."""
+        symbol = symbol.upper()
+        with self._lock:
+            sub = self._subscriptions.get(user_id, {}).get(symbol)
+            if sub is None:
+                return False
+            sub = replace(sub, enabled=enabled)
+            self._subscriptions[user_id][symbol] = sub
+            self._set_row(sub)
             return True
-        return False
 
     def get_subscriptions(self, user_id: str) -> List[dict]:
         """Get all alert subscriptions for a user."""
-        if user_id not in self._subscriptions:
-            return []
+        with self._lock:
+            subs = list(self._subscriptions.get(user_id, {}).values())
         return [
             {
                 "symbol": sub.symbol,
@@ -97,66 +181,187 @@ class AlertManager:
                 "volume_threshold_multiplier": sub.volume_threshold_multiplier,
                 "enabled": sub.enabled,
             }
-            for sub in self._subscriptions[user_id].values()
+            for sub in subs
         ]
 
-    def process_ticks(self, ticks: Dict[str, dict]) -> List[dict]:
+    def _set_row(self, sub: AlertSubscription):
+        """Write a subscription into its table row.
+
+        Enabled subscriptions get a row (appended if new); disabled ones
+        have theirs removed, so only enabled subscriptions are screened.
+        """
+        key = (sub.user_id, sub.symbol)
+        row = self._rows.get(key)
+        if not sub.enabled:
+            if row is not None:
+                self._delete_row(key)
+            return
+        if row is None:
+            row = self._append_row(key)
+        # Same fallback as SpikeDetector: a missing/zero threshold uses the default
+        self._sub_price_thr[row] = (
+            sub.price_threshold_pct or self.detector.default_price_threshold_pct
+        )
+        self._sub_vol_thr[row] = (
+            sub.volume_threshold_multiplier
+            or self.detector.default_volume_threshold_multiplier
+        )
+
+    def _append_row(self, key: Tuple[str, str]) -> int:
+        """Claim the next table row for key, growing the arrays if full."""
+        row = self._n_rows
+        if row == self._sub_user_ids.size:
+            capacity = max(8, 2 * row)
+            self._sub_user_ids = _grow(self._sub_user_ids, capacity)
+            self._sub_price_thr = _grow(self._sub_price_thr, capacity)
+            self._sub_vol_thr = _grow(self._sub_vol_thr, capacity)
+            self._cooldowns = _grow(self._cooldowns, capacity)
+
+        user_id, symbol = key
+        self._sub_user_ids[row] = self._user_ids[user_id]
+        self._cooldowns[:, row] = self._retired_cooldowns.pop(key, 0.0)
+        group = self._by_symbol.get(symbol)
+        self._by_symbol[symbol] = (
+            np.array([row], dtype=np.intp) if group is None else np.append(group, row)
+        )
+        self._rows[key] = row
+        self._row_keys.append(key)
+        self._n_rows += 1
+        return row
+
+    def _delete_row(self, key: Tuple[str, str]):
+        """Remove key's row by moving the last row into its place."""
+        row = self._rows.pop(key)
+        if self._cooldowns[:, row].any():
+            self._retired_cooldowns[key] = self._cooldowns[:, row].copy()
+        group = self._by_symbol[key[1]]
+        group = group[group != row]
+        if group.size:
+            self._by_symbol[key[1]] = group
+        else:
+            del self._by_symbol[key[1]]
+
+        last = self._n_rows - 1
+        moved = self._row_keys.pop()
+        if row != last:
+            for column in (
+                self._sub_user_ids,
+                self._sub_price_thr,
+                self._sub_vol_thr,
+            ):
+                column[row] = column[last]
+            self._cooldowns[:, row] = self._cooldowns[:, last]
+            self._rows[moved] = row
+            self._row_keys[row] = moved
+            moved_group = self._by_symbol[moved[1]]
+            moved_group[moved_group == last] = row
+        self._n_rows = last
+
+    def _find_spikes(
+        self, ticks: Dict[str, dict], arrays=None
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Evaluate both spike rules for subscriptions to symbols in ``ticks``.
+
+        With ``arrays`` (a provider TickArrays matching ``ticks``) the tick
+        values are gathered from its columns instead of the tick dicts.
+
+        Returns:
+            (rows, symbols, hits): table rows in subscription order, the
+            symbol of each row, and a (len(AlertType), len(rows)) mask of
+            threshold crossings
+        """
+        active = [(symbol, ticks[symbol]) for symbol in self._by_symbol if symbol in ticks]
+        if not active:
+            return np.empty(0, dtype=np.intp), [], np.zeros((len(AlertType), 0), dtype=bool)
+
+        groups = [self._by_symbol[symbol] for symbol, _ in active]
+        rows = np.concatenate(groups)
+        tick_pos = np.repeat(np.arange(len(active)), [len(g) for g in groups])
+        order = np.argsort(rows, kind="stable")
+        rows, tick_pos = rows[order], tick_pos[order]
+
+        if arrays is not None:
+            pos = np.array([arrays.index[symbol] for symbol, _ in active], dtype=np.intp)
+            price, prev_close = arrays.price[pos], arrays.prev_close[pos]
+            volume, avg_volume = arrays.volume[pos], arrays.avg_volume[pos]
+        else:
+            price = np.array([t["price"] for _, t in active], dtype=np.float64)
+            prev_close = np.array(
+                [t.get("prev_close", t.get("open", 0)) for _, t in active], dtype=np.float64
+            )
+            volume = np.array([t.get("volume", 0) for _, t in active], dtype=np.float64)
+            avg_volume = np.array([t.get("avg_volume", 1) for _, t in active], dtype=np.float64)
+
+        hits = _detect_spikes(
+            price[tick_pos],
+            prev_close[tick_pos],
+            volume[tick_pos],
+            avg_volume[tick_pos],
+            self._sub_price_thr[rows],
+            self._sub_vol_thr[rows],
+        )
+        symbols = [active[pos][0] for pos in tick_pos.tolist()]
+        return rows, symbols, hits
+
+    def process_ticks(self, ticks: Dict[str, dict], arrays=None) -> List[dict]:
         """Process a batch of ticks against all active subscriptions.
 
         Args:
             ticks: Dict mapping symbol -> tick data
+            arrays: Optional provider TickArrays holding the same ticks' values
 
         Returns:
             List of triggered alert dicts
         """
         triggered = []
+        fired: List[Tuple[str, SpikeAlert]] = []
+
+        # Screen under the lock so rows cannot move or vanish mid-batch;
+        # listeners run after it is released
+        with self._lock:
+            rows, symbols, hits = self._find_spikes(ticks, arrays)
+            if not rows.size:
+                return triggered
 
-        for user_id, user_subs in self._subscriptions.items():
-            for symbol, sub in user_subs.items():
-                if not sub.enabled:
-                    continue
-                if symbol not in ticks:
-                    continue
+            now = time.time()
+            last_alert = self._cooldowns[:, rows]
+            fire = hits & (now - last_alert >= self._cooldown_seconds)
+            self._cooldowns[:, rows] = np.where(fire, now, last_alert)
 
-                tick = ticks[symbol]
+            for i in np.flatnonzero(fire.any(axis=0)):
+                row = rows[i]
+                user_id = self._user_names[self._sub_user_ids[row]]
+                symbol = symbols[i]
                 alerts = self.detector.analyze_tick(
-                    tick,
-                    price_threshold_pct=sub.price_threshold_pct,
-                    volume_threshold_multiplier=sub.volume_threshold_multiplier,
+                    ticks[symbol],
+                    price_threshold_pct=float(self._sub_price_thr[row]),
+                    volume_threshold_multiplier=float(self._sub_vol_thr[row]),
                 )
 
                 for alert in alerts:
-                    if self._is_in_cooldown(user_id, symbol, alert.alert_type):
+                    if not fire[AlertType[alert.alert_type.upper()], i]:
                         continue
 
-                    self._set_cooldown(user_id, symbol, alert.alert_type)
                     triggered.append(
                         {
                             "user_id": user_id,
                             "alert": alert.to_dict(),
                         }
                     )
+                    fired.append((user_id, alert))
 
-                    # Notify listeners
-                    for listener in self._alert_listeners:
-                        try:
-                            listener(user_id, alert)
-                        except Exception as e:
-                            logger.error(f"Error in alert listener: {e}")
+        # Notify listeners once with the whole batch
+        if fired:
+            for listener in self._alert_listeners:
+                try:
+                    listener(fired)
+                except Exception as e:
+                    logger.error(f"Error in alert listener: {e}")
 
         return triggered
 
-    def _is_in_cooldown(self, user_id: str, symbol: str, alert_type: str) -> bool:
-        """Check if an alert is within the cooldown window."""
-        key = (user_id, symbol, alert_type)
-        last_time = self._cooldowns.get(key, 0)
-        return (time.time() - last_time) < self._cooldown_seconds
-
-    def _set_cooldown(self, user_id: str, symbol: str, alert_type: str):
-        """Set the cooldown timestamp for an alert."""
-        key = (user_id, symbol, alert_type)
-        self._cooldowns[key] = time.time()
-
     def clear_cooldowns(self):
         """Clear all cooldowns (useful for testing)."""
-        self._cooldowns.clear()
+        with self._lock:
+            self._cooldowns[:] = 0.0
+            self._retired_cooldowns.clear()
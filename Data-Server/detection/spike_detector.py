@@ -7,12 +7,59 @@ Triggers alerts when user-defined price or volume thresholds are crossed.
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+# _check_spikes() result bits
+_PRICE_SPIKE = 1
+_VOLUME_SPIKE = 2
+
+
+@njit(cache=True)
+def _check_spikes(price, prev_close, volume, avg_volume, price_threshold, volume_threshold):
+    """Numeric core of SpikeDetector.analyze_tick.
+
+    Returns (mask, change_pct, volume_ratio) where mask has _PRICE_SPIKE
+    and/or _VOLUME_SPIKE set for each crossed threshold; change_pct and
+    volume_ratio are only computed (non-zero) for the rules that fired.
+    """
+    mask = 0
+    change_pct = 0.0
+    volume_ratio = 0.0
+    # Compare cross-multiplied (both denominators are positive here) and
+    # only divide once a threshold is actually crossed.
+    if prev_close > 0:
+        delta = price - prev_close
+        if abs(delta) * 100.0 >= price_threshold * prev_close:
+            change_pct = (delta / prev_close) * 100.0
+            mask |= _PRICE_SPIKE
+    if avg_volume > 0:
+        if volume >= volume_threshold * avg_volume:
+            volume_ratio = volume / avg_volume
+            mask |= _VOLUME_SPIKE
+    return mask, change_pct, volume_ratio
+
+
+@njit(cache=True)
+def _scan_spikes(price, prev_close, volume, avg_volume, price_threshold, volume_threshold):
+    """Numeric core of SpikeDetector.analyze_ticks.
+
+    Applies _check_spikes' comparisons to whole columns and returns the
+    (price_hit, volume_hit) bool masks.
+    """
+    price_hit = (prev_close > 0) & (
+        np.abs(price - prev_close) * 100.0 >= price_threshold * prev_close
+    )
+    volume_hit = (avg_volume > 0) & (volume >= volume_threshold * avg_volume)
+    return price_hit, volume_hit
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpikeAlert:
     """Represents a detected spike event."""
 
@@ -24,6 +71,8 @@ class SpikeAlert:
     threshold: float
     reference_value: float
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Serialized form, filled on first to_dict() (the alert is immutable)
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
 
     def message(self) -> str:
         if self.alert_type == "price":
@@ -39,6 +88,11 @@ class SpikeAlert:
         return f"{self.symbol} threshold crossed."
 
     def to_dict(self) -> dict:
+        if self._dict is None:
+            object.__setattr__(self, "_dict", self._build_dict())
+        return dict(self._dict)
+
+    def _build_dict(self) -> dict:
         return {
             "symbol": self.symbol,
             "alert_type": self.alert_type,
@@ -89,9 +143,11 @@ class SpikeDetector:
             return None
 
         threshold = threshold_pct or self.default_price_threshold_pct
-        change_pct = ((current_price - prev_close) / prev_close) * 100.0
+        delta = current_price - prev_close
 
-        if abs(change_pct) >= threshold:
+        # prev_close > 0, so compare without dividing on the no-spike path
+        if abs(delta) * 100.0 >= threshold * prev_close:
+            change_pct = (delta / prev_close) * 100.0
             direction = "up" if change_pct > 0 else "down"
             return SpikeAlert(
                 symbol=symbol,
@@ -126,9 +182,9 @@ class SpikeDetector:
             return None
 
         threshold = threshold_multiplier or self.default_volume_threshold_multiplier
-        volume_ratio = current_volume / avg_volume
 
-        if volume_ratio >= threshold:
+        if current_volume >= threshold * avg_volume:
+            volume_ratio = current_volume / avg_volume
             return SpikeAlert(
                 symbol=symbol,
                 alert_type="volume",
@@ -158,22 +214,127 @@ class SpikeDetector:
         """
         alerts = []
 
-        price_alert = self.check_price_spike(
-            symbol=tick["symbol"],
-            current_price=tick["price"],
-            prev_close=tick.get("prev_close", tick.get("open", 0)),
-            threshold_pct=price_threshold_pct,
+        symbol = tick["symbol"]
+        current_price = tick["price"]
+        prev_close = tick.get("prev_close", tick.get("open", 0))
+        current_volume = tick.get("volume", 0)
+        avg_volume = tick.get("avg_volume", 1)
+        price_threshold = price_threshold_pct or self.default_price_threshold_pct
+        volume_threshold = (
+            volume_threshold_multiplier or self.default_volume_threshold_multiplier
+        )
+
+        mask, change_pct, volume_ratio = _check_spikes(
+            float(current_price),
+            float(prev_close),
+            float(current_volume),
+            float(avg_volume),
+            float(price_threshold),
+            float(volume_threshold),
+        )
+        if not mask:
+            return alerts
+
+        if mask & _PRICE_SPIKE:
+            alerts.append(SpikeAlert(
+                symbol=symbol,
+                alert_type="price",
+                direction="up" if change_pct > 0 else "down",
+                magnitude=abs(change_pct),
+                current_value=current_price,
+                threshold=price_threshold,
+                reference_value=prev_close,
+            ))
+
+        if mask & _VOLUME_SPIKE:
+            alerts.append(SpikeAlert(
+                symbol=symbol,
+                alert_type="volume",
+                direction="up",
+                magnitude=round(volume_ratio, 2),
+                current_value=current_volume,
+                threshold=volume_threshold,
+                reference_value=avg_volume,
+            ))
+
+        return alerts
+
+    def analyze_ticks(
+        self,
+        ticks: Mapping[str, "np.ndarray"],
+        price_threshold_pct: Optional[float] = None,
+        volume_threshold_multiplier: Optional[float] = None,
+    ) -> List[SpikeAlert]:
+        """Analyze a batch of ticks held as columns (a dict of arrays or a DataFrame).
+
+        Same rules as analyze_tick, evaluated over the whole batch by the
+        _scan_spikes kernel; SpikeAlerts are only built for the rows that cross a
+        threshold, all stamped with one batch timestamp.
+
+        Args:
+            ticks: Columns symbol, price, prev_close, volume, avg_volume
+            price_threshold_pct: Custom price threshold
+            volume_threshold_multiplier: Custom volume threshold
+
+        Returns:
+            Detected SpikeAlerts in row order, price before volume per row
+        """
+        price = np.asarray(ticks["price"], dtype=np.float64)
+        prev_close = np.asarray(ticks["prev_close"], dtype=np.float64)
+        volume = np.asarray(ticks["volume"], dtype=np.float64)
+        avg_volume = np.asarray(ticks["avg_volume"], dtype=np.float64)
+        price_threshold = price_threshold_pct or self.default_price_threshold_pct
+        volume_threshold = (
+            volume_threshold_multiplier or self.default_volume_threshold_multiplier
         )
-        if price_alert:
-            alerts.append(price_alert)
-
-        volume_alert = self.check_volume_spike(
-            symbol=tick["symbol"],
-            current_volume=tick.get("volume", 0),
-            avg_volume=tick.get("avg_volume", 1),
-            threshold_multiplier=volume_threshold_multiplier,
+
+        price_hit, volume_hit = _scan_spikes(
+            price,
+            prev_close,
+            volume,
+            avg_volume,
+            float(price_threshold),
+            float(volume_threshold),
         )
-        if volume_alert:
-            alerts.append(volume_alert)
+        rows = np.flatnonzero(price_hit | volume_hit)
+        if not rows.size:
+            return []
 
+        # Divide only where that rule fired: its reference is then positive,
+        # while the other rule's reference in the same row may be zero
+        zeros = np.zeros(rows.size)
+        change_pct = (np.divide(
+            price[rows] - prev_close[rows], prev_close[rows],
+            out=zeros.copy(), where=price_hit[rows],
+        ) * 100.0).tolist()
+        volume_ratio = np.divide(
+            volume[rows], avg_volume[rows], out=zeros, where=volume_hit[rows],
+        ).tolist()
+        symbols = np.asarray(ticks["symbol"])[rows].tolist()
+        timestamp = datetime.now().isoformat()
+
+        alerts = []
+        for i, row in enumerate(rows.tolist()):
+            if price_hit[row]:
+                alerts.append(SpikeAlert(
+                    symbol=symbols[i],
+                    alert_type="price",
+                    direction="up" if change_pct[i] > 0 else "down",
+                    magnitude=abs(change_pct[i]),
+                    current_value=float(price[row]),
+                    threshold=price_threshold,
+                    reference_value=float(prev_close[row]),
+                    timestamp=timestamp,
+                ))
+            if volume_hit[row]:
+                alerts.append(SpikeAlert(
+                    symbol=symbols[i],
+                    alert_type="volume",
+                    direction="up",
+                    magnitude=round(volume_ratio[i], 2),
+                    current_value=float(volume[row]),
+                    threshold=volume_threshold,
+                    reference_value=float(avg_volume[row]),
+                    timestamp=timestamp,
+                ))
         return alerts
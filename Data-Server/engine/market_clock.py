@@ -4,6 +4,7 @@ Trading Hours: Sunday–Thursday, 11:00 AM – 3:00 PM NPT (UTC+5:45)
 """
 
 import logging
+import time as time_mod
 from datetime import datetime, time, timedelta, timezone
 
 from config import Config
@@ -13,6 +14,9 @@ logger = logging.getLogger(__name__)
 # Nepal Standard Time: UTC+5:45
 NPT = timezone(timedelta(hours=5, minutes=45))
 
+# How long is_market_open() may reuse its last computed answer
+MARKET_OPEN_CACHE_SECONDS = 1.0
+
 
 class MarketClock:
     """Manages NEPSE market schedule and trading status.
@@ -24,9 +28,62 @@ class MarketClock:
     def __init__(self):
         self.open_time = time(Config.MARKET_OPEN_HOUR, Config.MARKET_OPEN_MINUTE)
         self.close_time = time(Config.MARKET_CLOSE_HOUR, Config.MARKET_CLOSE_MINUTE)
-        self.trading_days = set(Config.MARKET_TRADING_DAYS)
-        self.force_open = Config.FORCE_MARKET_OPEN
+        self.trading_days = Config.MARKET_TRADING_DAYS
         self.holidays = self._parse_holidays()
+        self.force_open = Config.FORCE_MARKET_OPEN
+
+    def _reset_caches(self):
+        """Forget every cached answer; called whenever the schedule changes."""
+        # (epoch second, status) of the last get_market_status() result
+        self._status_cache = (-1, {})
+        # (monotonic expiry, is_open) of the last is_market_open() check
+        self._open_cache = (0.0, False)
+        # (date ordinal, is_trading_day) of the last date checked
+        self._trading_day_cache = (-1, False)
+
+    @property
+    def trading_days(self) -> frozenset:
+        """Weekdays the market trades on (Python: Monday=0, Sunday=6).
+
+        Immutable so it can only change by assignment, which resets the
+        cached calendar answers.
+        """
+        return self._trading_days
+
+    @trading_days.setter
+    def trading_days(self, value):
+        self._trading_days = frozenset(value)
+        self._reset_caches()
+
+    @property
+    def holidays(self) -> frozenset:
+        """Public holidays as MM-DD strings; assign a new set to change them."""
+        return self._holidays
+
+    @holidays.setter
+    def holidays(self, value):
+        self._holidays = frozenset(value)
+        self._reset_caches()
+
+    @property
+    def force_open(self) -> bool:
+        """FORCE_MARKET_OPEN override; when set, the market is always open."""
+        return self._force_open
+
+    @force_open.setter
+    def force_open(self, value: bool):
+        self._force_open = value
+        self._reset_caches()
+        # Specialize the per-tick check: a forced-open clock never needs
+        # to look at the calendar
+        if value:
+            self.is_market_open = self._always_open
+        else:
+            self.__dict__.pop("is_market_open", None)
+
+    @staticmethod
+    def _always_open() -> bool:
+        return True
 
     def _parse_holidays(self) -> set:
         """Parse public holidays from config (MM-DD format)."""
@@ -45,14 +102,18 @@ class MarketClock:
         """Check if the given date is a NEPSE trading day."""
         if dt is None:
             dt = self.now_npt()
-        # Check weekday (Python: Monday=0, Sunday=6)
-        if dt.weekday() not in self.trading_days:
-            return False
-        # Check public holidays
-        date_str = dt.strftime("%m-%d")
-        if date_str in self.holidays:
-            return False
-        return True
+        ordinal = dt.toordinal()
+        cached_ordinal, is_trading = self._trading_day_cache
+        if ordinal == cached_ordinal:
+            return is_trading
+
+        # Check weekday (Python: Monday=0, Sunday=6), then public holidays
+        is_trading = (
+            dt.weekday() in self.trading_days
+            and not (self.holidays and f"{dt.month:02d}-{dt.day:02d}" in self.holidays)
+        )
+        self._trading_day_cache = (ordinal, is_trading)
+        return is_trading
 
     def is_within_trading_hours(self, dt: datetime = None) -> bool:
         """Check if current time falls within NEPSE trading hours."""
@@ -64,18 +125,41 @@ class MarketClock:
     def is_market_open(self) -> bool:
         """Check if the NEPSE market is currently open.
 
-        Considers trading days, hours, and the FORCE_MARKET_OPEN config.
+        Considers trading days, hours, and the FORCE_MARKET_OPEN config
+        (with force_open set, this method is replaced by _always_open).
+        The calendar check is cached for MARKET_OPEN_CACHE_SECONDS since
+        the engine loop calls this on every tick.
         """
-        if self.force_open:
-            return True
+        mono = time_mod.monotonic()
+        expires, is_open = self._open_cache
+        if mono < expires:
+            return is_open
 
         now = self.now_npt()
-        return self.is_trading_day(now) and self.is_within_trading_hours(now)
+        is_open = self.is_trading_day(now) and self.is_within_trading_hours(now)
+        self._open_cache = (mono + MARKET_OPEN_CACHE_SECONDS, is_open)
+        return is_open
 
     def get_market_status(self) -> dict:
-        """Return comprehensive market status information."""
+        """Return comprehensive market status information.
+
+        The status only reports time to the second, so it is built at most
+        once per wall-clock second; each call gets its own copy.
+        """
+        second = int(time_mod.time())
+        cached_second, status = self._status_cache
+        if second != cached_second:
+            status = self._build_market_status()
+            self._status_cache = (second, status)
+        return dict(status)
+
+    def _build_market_status(self) -> dict:
+        # Every field comes from one reading of the clock (not the
+        # is_market_open() cache), so they always agree with each other
         now = self.now_npt()
-        is_open = self.is_market_open()
+        is_trading_day = self.is_trading_day(now)
+        is_within_hours = self.is_within_trading_hours(now)
+        is_open = self.force_open or (is_trading_day and is_within_hours)
 
         status = {
             "is_open": is_open,
@@ -83,8 +167,8 @@ class MarketClock:
             "trading_hours": f"{self.open_time.strftime('%H:%M')} - {self.close_time.strftime('%H:%M')} NPT",
             "trading_days": "Sunday - Thursday",
             "force_open": self.force_open,
-            "is_trading_day": self.is_trading_day(now),
-            "is_within_hours": self.is_within_trading_hours(now),
+            "is_trading_day": is_trading_day,
+            "is_within_hours": is_within_hours,
         }
 
         if is_open and not self.force_open:
@@ -12,6 +12,7 @@ from typing import Callable, List, Optional
 from config import Config
 from engine.market_clock import MarketClock
 from providers.base import DataProvider
+from utils.fastjson import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,8 @@ class MarketEngine:
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._tick_listeners: List[Callable] = []
+        self._json_tick_listeners: List[Callable] = []
+        self._tick_delta_listeners: List[Callable] = []
         self._market_status_listeners: List[Callable] = []
         self._was_open = False
 
@@ -40,6 +43,22 @@ class MarketEngine:
         """Register a callback to be called on every tick batch."""
         self._tick_listeners.append(callback)
 
+    def on_tick_json(self, callback: Callable[[bytes], None]):
+        """Register a callback that receives each tick batch as JSON bytes.
+
+        The batch is serialized once and the same payload is passed to every
+        JSON listener.
+        """
+        self._json_tick_listeners.append(callback)
+
+    def on_tick_delta(self, callback: Callable[[dict], None]):
+        """Register a callback that only receives the ticks whose price moved.
+
+        Uses the provider's tick_delta() when it has one; otherwise the
+        callback receives the full batch.
+        """
+        self._tick_delta_listeners.append(callback)
+
     def on_market_status_change(self, callback: Callable[[dict], None]):
         """Register a callback for market open/close events."""
         self._market_status_listeners.append(callback)
@@ -66,8 +85,14 @@ class MarketEngine:
         logger.info("Market engine stopped")
 
     def _run_loop(self):
-        """Main simulation loop."""
+        """Main simulation loop.
+
+        Iterations are scheduled against monotonic deadlines, so the time
+        spent generating a batch does not stretch the tick interval.
+        """
+        next_deadline = time_mod.monotonic()
         while self._running:
+            next_deadline += self.tick_interval
             try:
                 is_open = self.clock.is_market_open()
 
@@ -87,21 +112,32 @@ class MarketEngine:
                 if is_open:
                     self._generate_all_ticks()
 
-                time_mod.sleep(self.tick_interval)
-
             except Exception as e:
                 logger.error(f"Error in market engine loop: {e}", exc_info=True)
-                time_mod.sleep(self.tick_interval)
+
+            sleep_for = next_deadline - time_mod.monotonic()
+            if sleep_for > 0:
+                time_mod.sleep(sleep_for)
+            else:
+                # Fell behind: start a fresh schedule instead of bursting to catch up
+                next_deadline = time_mod.monotonic()
 
     def _generate_all_ticks(self):
         """Generate ticks for all tracked symbols and notify listeners."""
-        all_ticks = {}
-        for symbol in self.provider.get_available_symbols():
+        if hasattr(self.provider, "generate_all_ticks_batch"):
             try:
-                tick = self.provider.generate_tick(symbol)
-                all_ticks[symbol] = tick
+                all_ticks = self.provider.generate_all_ticks_batch()
             except Exception as e:
-                logger.error(f"Error generating tick for {symbol}: {e}")
+                logger.error(f"Error generating tick batch: {e}")
+                all_ticks = {}
+        else:
+            all_ticks = {}
+            for symbol in self.provider.get_available_symbols():
+                try:
+                    tick = self.provider.generate_tick(symbol)
+                    all_ticks[symbol] = tick
+                except Exception as e:
+                    logger.error(f"Error generating tick for {symbol}: {e}")
 
         if all_ticks:
             for listener in self._tick_listeners:
@@ -110,6 +146,26 @@ class MarketEngine:
                 except Exception as e:
                     logger.error(f"Error in tick listener: {e}")
 
+            if self._json_tick_listeners:
+                payload = dumps(all_ticks)
+                for listener in self._json_tick_listeners:
+                    try:
+                        listener(payload)
+                    except Exception as e:
+                        logger.error(f"Error in JSON tick listener: {e}")
+
+            if self._tick_delta_listeners:
+                if hasattr(self.provider, "tick_delta"):
+                    delta = self.provider.tick_delta(all_ticks)
+                else:
+                    delta = all_ticks
+                if delta:
+                    for listener in self._tick_delta_listeners:
+                        try:
+                            listener(delta)
+                        except Exception as e:
+                            logger.error(f"Error in tick delta listener: {e}")
+
     def _emit_market_status(self, status: str):
         """Emit market status change event."""
         event = {
@@ -1,7 +1,27 @@
 """Abstract base class for data providers — provider-agnostic architecture."""
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class TickArrays:
+    """Struct-of-arrays copy of the latest tick values, one row per symbol.
+
+    Providers that keep their state in arrays can offer this through an
+    optional ``tick_arrays()`` method, so numeric consumers such as the
+    alert manager skip reading fields out of tick dicts.
+    """
+
+    index: Mapping[str, int]  # symbol -> row
+    price: np.ndarray
+    prev_close: np.ndarray
+    volume: np.ndarray
+    avg_volume: np.ndarray
 
 
 class DataProvider(ABC):
@@ -30,11 +50,35 @@ class DataProvider(ABC):
         """
         pass
 
+    def get_history_columns(self, symbol: str, days: int = 50) -> Dict[str, list]:
+        """Column-oriented get_history: field -> values, oldest first (optional override)."""
+        history = self.get_history(symbol, days)
+        if not history:
+            return {}
+        return {key: [record[key] for record in history] for key in history[0]}
+
     @abstractmethod
     def get_all_ticks(self) -> Dict[str, dict]:
         """Get latest ticks for all tracked symbols."""
         pass
 
+    def snapshot_view(self) -> Mapping[str, dict]:
+        """Read-only mapping of the latest tick per symbol (optional override).
+
+        Providers that keep their latest ticks around can return a live
+        view instead of building a copy.
+        """
+        return MappingProxyType(self.get_all_ticks())
+
+    def get_latest_ticks(self, symbols: Iterable[str]) -> Dict[str, dict]:
+        """Latest ticks for several symbols in one call (optional override).
+
+        Symbols without a tick are left out. The tick dicts come straight
+        from snapshot_view(), so treat them as read-only.
+        """
+        latest = self.snapshot_view()
+        return {symbol: latest[symbol] for symbol in symbols if symbol in latest}
+
     @abstractmethod
     def generate_tick(self, symbol: str) -> dict:
         """Generate / fetch a new tick for a symbol and update internal state."""
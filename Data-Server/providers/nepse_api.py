@@ -5,11 +5,15 @@ data. Replace the implementation with actual NEPSE API calls when a live
 data feed becomes available.
 """
 
-from typing import Callable, Dict, List, Optional
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
 from data.stock_registry import get_all_symbols, get_historical_data
 from providers.base import DataProvider
 
+HISTORY_CACHE_SIZE = 2048  # (symbol, days) entries kept by get_history
+
 
 class NepseApiProvider(DataProvider):
     """Placeholder for live NEPSE API data feed.
@@ -22,6 +26,24 @@ class NepseApiProvider(DataProvider):
     def __init__(self, api_base_url: str = ""):
         self.api_base_url = api_base_url
 
+        # History and the symbol list are end-of-day data, so lookups are
+        # cached until the calendar day changes (see _expire_caches)
+        self._cache_day: Optional[date] = None
+        self._symbols: Optional[Tuple[str, ...]] = None
+        self._history = lru_cache(maxsize=HISTORY_CACHE_SIZE)(self._load_history)
+
+    def _expire_caches(self):
+        """Drop cached lookups once the calendar day has changed."""
+        today = date.today()
+        if today != self._cache_day:
+            self._history.cache_clear()
+            self._symbols = None
+            self._cache_day = today
+
+    @staticmethod
+    def _load_history(symbol: str, days: int) -> Tuple[dict, ...]:
+        return tuple(get_historical_data(symbol, days=days))
+
     def get_latest_tick(self, symbol: str) -> Optional[dict]:
         raise NotImplementedError(
             "Live NEPSE API integration is not yet implemented. "
@@ -29,7 +51,8 @@ class NepseApiProvider(DataProvider):
         )
 
     def get_history(self, symbol: str, days: int = 50) -> List[dict]:
-        return get_historical_data(symbol.upper(), days=days)
+        self._expire_caches()
+        return list(self._history(symbol.upper(), days))
 
     def get_all_ticks(self) -> Dict[str, dict]:
         raise NotImplementedError("Live NEPSE API integration is not yet implemented.")
@@ -37,8 +60,11 @@ class NepseApiProvider(DataProvider):
     def generate_tick(self, symbol: str) -> dict:
         raise NotImplementedError("Live NEPSE API integration is not yet implemented.")
 
-    def get_available_symbols(self) -> List[str]:
-        return get_all_symbols()
+    def get_available_symbols(self) -> Tuple[str, ...]:
+        self._expire_caches()
+        if self._symbols is None:
+            self._symbols = tuple(get_all_symbols())
+        return self._symbols
 
     def subscribe(self, symbol: str, callback: Callable[[dict], None]) -> None:
         pass
@@ -9,19 +9,24 @@ Instead of floating around a single LTP, this simulator:
 
 import logging
 import random
+import time as time_mod
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 
 import numpy as np
 
 from data.stock_registry import (
     get_average_volume,
+    get_historical_columns,
     get_historical_data,
     get_stock_info,
     get_tracked_symbols,
     get_volatility,
 )
-from providers.base import DataProvider
+from providers.base import DataProvider, TickArrays
+from utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,70 @@ logger = logging.getLogger(__name__)
 REPLAY_WINDOW_DAYS = 7        # Replay this many real trading days
 HISTORY_LOOKBACK_DAYS = 30    # Pick random start from last N days
 TICKS_PER_DAY = 200           # Number of ticks to generate per simulated day
+TIMESTAMP_CACHE_SECONDS = 0.05  # Ticks this close together share a timestamp
+
+# Per-tick day progress (0.0 → 1.0) and intraday volume shape; these only
+# depend on the tick index, so they are computed once
+_DAY_PROGRESS = np.minimum(np.arange(TICKS_PER_DAY) / max(TICKS_PER_DAY - 1, 1), 1.0)
+_VOLUME_CURVE = np.sin(_DAY_PROGRESS * np.pi)  # peaks at midday
+
+# Intraday phase of every tick index (0: O→H, 1: H→L, 2: L→C, 3: settle)
+# and the fraction of that phase completed at the tick
+_PHASE_STARTS = np.array([0.0, 0.25, 0.50, 0.80])
+_PHASE_LENGTHS = np.array([0.25, 0.25, 0.30, 0.20])
+_DAY_PHASE = np.searchsorted(_PHASE_STARTS, _DAY_PROGRESS, side="right") - 1
+_PHASE_T = (_DAY_PROGRESS - _PHASE_STARTS[_DAY_PHASE]) / _PHASE_LENGTHS[_DAY_PHASE]
+_SETTLE_START = int(np.searchsorted(_DAY_PHASE, 3))  # first tick that sits at Close
+
+
+def _to_paisa(price):
+    """Convert rupee price(s) to int64 paisa — the simulator's fixed-point state."""
+    return np.rint(np.asarray(price, dtype=np.float64) * 100).astype(np.int64)
+
+
+@dataclass(slots=True, frozen=True)
+class SymbolInfo:
+    """Per-symbol tick fields that stay fixed for the whole simulation."""
+
+    symbol: str
+    name: str
+    sector: str
+    avg_volume: float
+    volatility: float
+
+
+@njit(cache=True)
+def _simulate_day(
+    open_p, high_p, low_p, close_p, day_volume, noise,
+    day_phase, phase_t, settle_start, volume_curve,
+):
+    """Generate one replay day's per-tick prices and tick volumes.
+
+    Prices interpolate through O → H → L → C phases plus noise scaled to
+    the day's range (``noise`` is one standard normal draw per tick):
+
+    Phase 1 (0.00–0.25): Open → High
+    Phase 2 (0.25–0.50): High → Low
+    Phase 3 (0.50–0.80): Low → Close
+    Phase 4 (0.80–1.00): Settle at Close
+
+    Volume is spread across ticks following ``volume_curve`` (more volume
+    in the middle of the day), at least 1 per tick.
+    """
+    ticks = day_phase.shape[0]
+    points = np.array([open_p, high_p, low_p, close_p])
+    phase = day_phase[:settle_start]
+    start = points[phase]
+
+    curve = np.full(ticks, close_p)
+    curve[:settle_start] = start + (points[phase + 1] - start) * phase_t[:settle_start]
+
+    sigma = max(high_p - low_p, 0.01) * 0.02
+    prices = np.maximum(curve + noise * sigma, 1.0)
+    tick_volumes = np.maximum(
+        1, ((day_volume / ticks) * (0.5 + volume_curve)).astype(np.int64)
+    )
+    return prices, tick_volumes
 
 
 class SimulatorProvider(DataProvider):
@@ -39,20 +108,28 @@ class SimulatorProvider(DataProvider):
     - Walks toward High and Low during the day
     - Converges to real Close (LTP) at end of day
     - Volume is distributed across ticks proportional to real Qty
+
+    State is kept as parallel NumPy arrays indexed by symbol id so a whole
+    tick batch is computed in one vectorized pass (generate_all_ticks_batch);
+    tick dicts are only built when a tick is emitted or read.
     """
 
     def __init__(self, symbols: List[str] = None):
         self._tracked_symbols = symbols or get_tracked_symbols()
-        self._current_state: Dict[str, dict] = {}
         self._subscribers: Dict[str, List[Callable]] = {}
 
         # Replay state per symbol
         self._replay: Dict[str, dict] = {}
+        # (time.time(), ISO string) of the last tick timestamp
+        self._ts_cache = (0.0, "")
+        # Price noise source (PCG64), drawn a day of ticks at a time
+        self._rng = np.random.default_rng()
 
         self._initialize()
 
     def _initialize(self):
         """Load historical data and set up replay windows for each symbol."""
+        self._static: List[SymbolInfo] = []
         for symbol in self._tracked_symbols:
             history = get_historical_data(symbol, days=HISTORY_LOOKBACK_DAYS)
             if len(history) < 2:
@@ -69,38 +146,147 @@ class SimulatorProvider(DataProvider):
             self._replay[symbol] = {
                 "full_history": history,
                 "window": replay_data,        # 7 days of OHLCV to replay
-                "day_index": 0,               # Current day within the window
-                "tick_index": 0,              # Current tick within the day
-                "ticks_per_day": TICKS_PER_DAY,
             }
+            self._static.append(SymbolInfo(
+                symbol=symbol,
+                name=info.get("name", symbol),
+                sector=info.get("sector", "Unknown"),
+                avg_volume=avg_vol,
+                volatility=volatility,
+            ))
 
-            # Initialize current state from the first day's open
-            first_day = replay_data[0]
-            self._current_state[symbol] = {
-                "symbol": symbol,
-                "name": info.get("name", symbol),
-                "sector": info.get("sector", "Unknown"),
-                "price": first_day["open"],
-                "open": first_day["open"],
-                "high": first_day["open"],
-                "low": first_day["open"],
-                "volume": 0,
-                "change": 0.0,
-                "change_pct": 0.0,
-                "prev_close": first_day["open"],
-                "avg_volume": avg_vol,
-                "volatility": volatility,
-                "replay_date": first_day.get("date", ""),
-                "replay_day": 1,
-                "replay_total_days": len(replay_data),
-                "timestamp": datetime.now().isoformat(),
-            }
+        self._build_arrays()
 
         logger.info(
-            f"Replay simulator initialized: {len(self._current_state)} stocks, "
+            f"Replay simulator initialized: {len(self._symbols)} stocks, "
             f"{REPLAY_WINDOW_DAYS}-day windows from last {HISTORY_LOOKBACK_DAYS} days"
         )
 
+    def _build_arrays(self):
+        """Lay the per-symbol state out as parallel arrays, starting at each first day's open."""
+        self._symbols: List[str] = [info.symbol for info in self._static]
+        self._symbol_to_idx: Dict[str, int] = {s: i for i, s in enumerate(self._symbols)}
+        # Immutable, so get_available_symbols can hand it out without copying
+        self._symbol_tuple: Tuple[str, ...] = tuple(self._symbols)
+        self._symbol_index: Mapping[str, int] = MappingProxyType(self._symbol_to_idx)
+        n = len(self._symbols)
+
+        # Live session state; prices are int64 paisa (see _to_paisa)
+        self._price = _to_paisa([self._replay[s]["window"][0]["open"] for s in self._symbols])
+        self._open = self._price.copy()
+        self._high = self._price.copy()
+        self._low = self._price.copy()
+        self._prev_close = self._price.copy()
+        # Price as of the last tick_delta() call (-1: never reported)
+        self._reported_price = np.full(n, -1, dtype=np.int64)
+        self._volume = np.zeros(n, dtype=np.int64)
+        self._change = np.zeros(n, dtype=np.int64)
+        self._change_pct = np.zeros(n, dtype=np.float64)
+        self._avg_volume = np.array([info.avg_volume for info in self._static], dtype=np.float64)
+        self._avg_volume.flags.writeable = False  # shared by every tick_arrays()
+        self._timestamps: List[str] = [self._timestamp()] * n
+        # Per-symbol dicts reused for every emitted tick (see _step)
+        self._emit_buffers: List[dict] = [{} for _ in range(n)]
+
+        # Replay position and the real OHLCV of the day being replayed
+        self._day_index = np.zeros(n, dtype=np.intp)
+        self._tick_index = np.zeros(n, dtype=np.intp)
+        self._window_len = np.array(
+            [len(self._replay[s]["window"]) for s in self._symbols], dtype=np.intp
+        )
+        self._day_open = np.empty(n, dtype=np.float64)
+        self._day_close = np.empty(n, dtype=np.float64)
+        # Precomputed price and volume of every tick of the current day
+        self._price_path = np.empty((n, TICKS_PER_DAY), dtype=np.float64)
+        self._volume_path = np.empty((n, TICKS_PER_DAY), dtype=np.int64)
+        for i in range(n):
+            self._load_day(i)
+
+        # Symbol -> emit buffer, i.e. the latest tick of every symbol
+        self._snapshot = self._tick_dicts(np.arange(n), reuse=True)
+        self._snapshot_view: Mapping[str, dict] = MappingProxyType(self._snapshot)
+
+    def _load_day(self, i: int):
+        """Load symbol ``i``'s current replay day and simulate its ticks."""
+        day = self._replay[self._symbols[i]]["window"][self._day_index[i]]
+        self._day_open[i] = day["open"]
+        self._day_close[i] = day["close"]
+        self._price_path[i], self._volume_path[i] = _simulate_day(
+            float(day["open"]),
+            float(day["high"]),
+            float(day["low"]),
+            float(day["close"]),
+            float(day.get("volume", 10000)),
+            self._rng.standard_normal(TICKS_PER_DAY),
+            _DAY_PHASE,
+            _PHASE_T,
+            _SETTLE_START,
+            _VOLUME_CURVE,
+        )
+
+    def _start_day(self, i: int, prev_close: int):
+        """Reset symbol ``i``'s session state to the open of its current replay day.
+
+        ``prev_close`` is in paisa.
+        """
+        self._load_day(i)
+        self._prev_close[i] = prev_close
+        self._open[i] = self._high[i] = self._low[i] = _to_paisa(self._day_open[i])
+        self._volume[i] = 0
+
+    def _tick_dicts(self, idx: np.ndarray, reuse: bool = False) -> Dict[str, dict]:
+        """Build the tick dicts for the symbols at positions ``idx``.
+
+        With ``reuse`` the symbols' emit buffers are refilled in place
+        instead of allocating new dicts.
+        """
+        fields = zip(
+            idx.tolist(),
+            (self._price[idx] / 100).tolist(),
+            (self._open[idx] / 100).tolist(),
+            (self._high[idx] / 100).tolist(),
+            (self._low[idx] / 100).tolist(),
+            self._volume[idx].tolist(),
+            (self._change[idx] / 100).tolist(),
+            self._change_pct[idx].tolist(),
+            (self._prev_close[idx] / 100).tolist(),
+            self._day_index[idx].tolist(),
+        )
+        ticks = {}
+        for i, price, open_, high, low, volume, change, change_pct, prev_close, day_idx in fields:
+            info = self._static[i]
+            symbol = info.symbol
+            window = self._replay[symbol]["window"]
+            tick = self._emit_buffers[i] if reuse else {}
+            tick["symbol"] = symbol
+            tick["name"] = info.name
+            tick["sector"] = info.sector
+            tick["price"] = price
+            tick["open"] = open_
+            tick["high"] = high
+            tick["low"] = low
+            tick["volume"] = volume
+            tick["change"] = change
+            tick["change_pct"] = change_pct
+            tick["prev_close"] = prev_close
+            tick["avg_volume"] = info.avg_volume
+            tick["volatility"] = info.volatility
+            tick["replay_date"] = window[day_idx].get("date", "")
+            tick["replay_day"] = day_idx + 1
+            tick["replay_total_days"] = len(window)
+            tick["timestamp"] = self._timestamps[i]
+            ticks[symbol] = tick
+        return ticks
+
+    def _timestamp(self) -> str:
+        """ISO timestamp for new ticks, reformatted at most every TIMESTAMP_CACHE_SECONDS."""
+        now = time_mod.time()
+        cached_at, stamp = self._ts_cache
+        if now - cached_at > TIMESTAMP_CACHE_SECONDS:
+            stamp = datetime.fromtimestamp(now).isoformat()
+            self._ts_cache = (now, stamp)
+        return stamp
+
     def _pick_replay_window(self, history: List[dict]) -> List[dict]:
         """Pick a random 7-day window from the last 30 days of history."""
         available = len(history)
@@ -114,65 +300,86 @@ class SimulatorProvider(DataProvider):
 
     def _advance_replay(self, symbol: str):
         """Move to the next replay window when current one is exhausted."""
+        i = self._symbol_to_idx[symbol]
         replay = self._replay[symbol]
         replay["window"] = self._pick_replay_window(replay["full_history"])
-        replay["day_index"] = 0
-        replay["tick_index"] = 0
+        self._window_len[i] = len(replay["window"])
+        self._day_index[i] = 0
+        self._tick_index[i] = 0
+        self._start_day(i, self._price[i])
 
         first_day = replay["window"][0]
-        state = self._current_state[symbol]
-        state["prev_close"] = state["price"]
-        state["open"] = first_day["open"]
-        state["high"] = first_day["open"]
-        state["low"] = first_day["open"]
-        state["volume"] = 0
-        state["replay_date"] = first_day.get("date", "")
-        state["replay_day"] = 1
-        state["replay_total_days"] = len(replay["window"])
-
         logger.info(f"{symbol}: New replay window starting from {first_day.get('date', '?')}")
 
     def reset_session(self):
         """Reset for a new trading session — advance to next replay day."""
-        for symbol in list(self._current_state.keys()):
-            if symbol not in self._replay:
-                continue
-
-            replay = self._replay[symbol]
-            replay["day_index"] += 1
-            replay["tick_index"] = 0
-
-            # If we've exhausted the window, pick a new one
-            if replay["day_index"] >= len(replay["window"]):
-                self._advance_replay(symbol)
-                continue
-
-            day_data = replay["window"][replay["day_index"]]
-            state = self._current_state[symbol]
-            state["prev_close"] = state["price"]
-            state["open"] = day_data["open"]
-            state["high"] = day_data["open"]
-            state["low"] = day_data["open"]
-            state["price"] = day_data["open"]
-            state["volume"] = 0
-            state["change"] = round(day_data["open"] - state["prev_close"], 2)
-            state["change_pct"] = round(
-                ((day_data["open"] - state["prev_close"]) / state["prev_close"]) * 100, 2
-            ) if state["prev_close"] else 0.0
-            state["replay_date"] = day_data.get("date", "")
-            state["replay_day"] = replay["day_index"] + 1
+        self._day_index += 1
+        self._tick_index[:] = 0
+
+        # If we've exhausted the window, pick a new one
+        exhausted = self._day_index >= self._window_len
+        for i in np.flatnonzero(exhausted).tolist():
+            self._advance_replay(self._symbols[i])
+
+        # Everyone else opens the next replay day at its real open
+        rows = np.flatnonzero(~exhausted)
+        for i in rows.tolist():
+            self._load_day(i)
+        prev_close = self._price[rows]
+        opens = _to_paisa(self._day_open[rows])
+        self._prev_close[rows] = prev_close
+        self._open[rows] = self._high[rows] = self._low[rows] = self._price[rows] = opens
+        self._volume[rows] = 0
+        change = opens - prev_close
+        self._change[rows] = change
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._change_pct[rows] = np.where(
+                prev_close != 0, np.round(change / prev_close * 100, 2), 0.0
+            )
+
+        # Refresh the snapshot; no tick has been emitted in the new session yet
+        for tick in self._tick_dicts(np.arange(len(self._symbols)), reuse=True).values():
+            tick["tick_volume"] = 0
+            tick["day_progress"] = 0.0
 
     def get_latest_tick(self, symbol: str) -> Optional[dict]:
-        return self._current_state.get(symbol.upper())
+        i = self._symbol_to_idx.get(symbol.upper())
+        if i is None:
+            return None
+        return self._tick_dicts(np.array([i], dtype=np.intp))[self._symbols[i]]
 
     def get_history(self, symbol: str, days: int = 50) -> List[dict]:
         return get_historical_data(symbol.upper(), days=days)
 
+    def get_history_columns(self, symbol: str, days: int = 50) -> Dict[str, list]:
+        return get_historical_columns(symbol.upper(), days=days)
+
     def get_all_ticks(self) -> Dict[str, dict]:
-        return dict(self._current_state)
+        return self._tick_dicts(np.arange(len(self._symbols)))
 
-    def get_available_symbols(self) -> List[str]:
-        return list(self._current_state.keys())
+    def snapshot_view(self) -> Mapping[str, dict]:
+        """Read-only, zero-copy view of the latest emitted tick per symbol.
+
+        The view tracks the emit buffers, so it always shows current
+        values; the tick dicts must not be mutated.
+        """
+        return self._snapshot_view
+
+    def tick_arrays(self) -> TickArrays:
+        """Latest price, prev_close, volume and avg_volume of every symbol as arrays.
+
+        Values match the corresponding fields of the emitted tick dicts.
+        """
+        return TickArrays(
+            index=self._symbol_index,
+            price=self._price / 100,
+            prev_close=self._prev_close / 100,
+            volume=self._volume.astype(np.float64),
+            avg_volume=self._avg_volume,
+        )
+
+    def get_available_symbols(self) -> Tuple[str, ...]:
+        return self._symbol_tuple
 
     def generate_tick(self, symbol: str) -> dict:
         """Generate the next intraday tick by interpolating real OHLCV data.
@@ -185,134 +392,120 @@ class SimulatorProvider(DataProvider):
 
         This creates a realistic intraday price curve that hits the real
         Open, High, Low, and Close values.
+
+        The returned dict is the symbol's emit buffer and is overwritten by
+        its next tick; copy it to keep it (get_latest_tick returns a copy).
         """
         symbol = symbol.upper()
-        if symbol not in self._replay or symbol not in self._current_state:
+        if symbol not in self._symbol_to_idx:
             raise ValueError(f"Unknown symbol: {symbol}")
 
-        replay = self._replay[symbol]
-        state = self._current_state[symbol]
+        idx = self._symbol_to_idx[symbol]
+        return self._step(np.array([idx], dtype=np.intp))[symbol]
 
-        day_idx = replay["day_index"]
-        tick_idx = replay["tick_index"]
-        ticks_per_day = replay["ticks_per_day"]
+    def generate_all_ticks_batch(self) -> Dict[str, dict]:
+        """Generate the next tick for every symbol in one vectorized pass.
 
-        # Get the current day's real OHLCV
-        if day_idx >= len(replay["window"]):
-            self._advance_replay(symbol)
-            day_idx = 0
-            tick_idx = 0
-
-        day = replay["window"][day_idx]
-        day_open = day["open"]
-        day_high = day["high"]
-        day_low = day["low"]
-        day_close = day["close"]
-        day_volume = day.get("volume", 10000)
-
-        # Progress through the day (0.0 → 1.0)
-        progress = min(tick_idx / max(ticks_per_day - 1, 1), 1.0)
-
-        # Intraday price interpolation with 4 phases
-        target_price = self._interpolate_price(
-            day_open, day_high, day_low, day_close, progress
-        )
+        Tick dicts are reused emit buffers, as with generate_tick.
+        """
+        if not self._symbols:
+            return {}
+        return self._step(np.arange(len(self._symbols)))
+
+    def tick_delta(self, ticks: Dict[str, dict]) -> Dict[str, dict]:
+        """Return the entries of ``ticks`` whose price moved since the last call.
+
+        The first call reports every symbol, so a delta consumer starts from
+        a full snapshot.
+        """
+        moved = np.flatnonzero(self._price != self._reported_price)
+        np.copyto(self._reported_price, self._price)
+        symbols = self._symbols
+        return {symbols[i]: ticks[symbols[i]] for i in moved.tolist() if symbols[i] in ticks}
+
+    def _step(self, idx: np.ndarray) -> Dict[str, dict]:
+        """Advance the symbols at positions ``idx`` by one tick (see generate_tick)."""
 
-        # Add small noise around the target (proportional to day's range)
-        day_range = max(day_high - day_low, 0.01)
-        noise = np.random.normal(0, day_range * 0.02)
-        new_price = max(target_price + noise, 1.0)
-
-        # Volume distribution — more volume in middle of day
-        vol_progress = np.sin(progress * np.pi)  # peaks at midday
-        tick_volume = max(1, int((day_volume / ticks_per_day) * (0.5 + vol_progress)))
-
-        # Update state
-        state["price"] = round(new_price, 2)
-        state["high"] = round(max(state["high"], new_price), 2)
-        state["low"] = round(min(state["low"], new_price), 2)
-        state["volume"] += tick_volume
-        prev_close = state["prev_close"]
-        state["change"] = round(new_price - prev_close, 2)
-        state["change_pct"] = round(
-            ((new_price - prev_close) / prev_close) * 100, 2
-        ) if prev_close else 0.0
-        state["timestamp"] = datetime.now().isoformat()
+        # Get the current day's real OHLCV
+        for i in idx[self._day_index[idx] >= self._window_len[idx]].tolist():
+            self._advance_replay(self._symbols[i])
+
+        tick_idx = self._tick_index[idx]
+        progress = _DAY_PROGRESS[tick_idx]
+
+        # Price and volume were simulated for the whole day at day start
+        new_price = self._price_path[idx, tick_idx]
+        tick_volume = self._volume_path[idx, tick_idx]
+
+        # Update state (rounding to paisa once)
+        price = _to_paisa(new_price)
+        prev_close = self._prev_close[idx]
+        self._price[idx] = price
+        self._high[idx] = np.maximum(self._high[idx], price)
+        self._low[idx] = np.minimum(self._low[idx], price)
+        self._volume[idx] += tick_volume
+        change = price - prev_close
+        self._change[idx] = change
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._change_pct[idx] = np.where(
+                prev_close != 0, np.round(change / prev_close * 100, 2), 0.0
+            )
+        timestamp = self._timestamp()
+        for i in idx.tolist():
+            self._timestamps[i] = timestamp
 
         # Advance tick counter
-        replay["tick_index"] = tick_idx + 1
+        self._tick_index[idx] = tick_idx + 1
 
         # If day is done, move to next day
-        if replay["tick_index"] >= ticks_per_day:
-            # Snap to exact close price at end of day
-            state["price"] = round(day_close, 2)
-            state["change"] = round(day_close - prev_close, 2)
-            state["change_pct"] = round(
-                ((day_close - prev_close) / prev_close) * 100, 2
-            ) if prev_close else 0.0
-
-            replay["day_index"] += 1
-            replay["tick_index"] = 0
-
-            # Set up next day
-            if replay["day_index"] < len(replay["window"]):
-                next_day = replay["window"][replay["day_index"]]
-                state["prev_close"] = day_close
-                state["open"] = next_day["open"]
-                state["high"] = next_day["open"]
-                state["low"] = next_day["open"]
-                state["volume"] = 0
-                state["replay_date"] = next_day.get("date", "")
-                state["replay_day"] = replay["day_index"] + 1
-                logger.info(
-                    f"{symbol}: Day {replay['day_index']}/{len(replay['window'])} "
-                    f"({next_day.get('date', '?')}), prev_close={day_close}"
-                )
-            else:
-                # Window exhausted — pick new random window
-                self._advance_replay(symbol)
-
-        tick_data = dict(state)
-        tick_data["tick_volume"] = tick_volume
-        tick_data["day_progress"] = round(progress * 100, 1)
-
-        # Notify subscribers
-        for callback in self._subscribers.get(symbol, []):
-            try:
-                callback(tick_data)
-            except Exception:
-                pass
-
-        return tick_data
-
-    @staticmethod
-    def _interpolate_price(
-        open_p: float, high_p: float, low_p: float, close_p: float,
-        progress: float
-    ) -> float:
-        """Interpolate intraday price through O → H → L → C phases.
-
-        Phase 1 (0.00–0.25): Open → High
-        Phase 2 (0.25–0.50): High → Low
-        Phase 3 (0.50–0.80): Low → Close
-        Phase 4 (0.80–1.00): Settle at Close
+        for j in np.flatnonzero(tick_idx + 1 >= TICKS_PER_DAY).tolist():
+            self._end_day(int(idx[j]), int(prev_close[j]))
+
+        ticks = self._tick_dicts(idx, reuse=True)
+        for (symbol, tick_data), tick_vol, day_pct in zip(
+            ticks.items(), tick_volume.tolist(), np.round(progress * 100, 1).tolist()
+        ):
+            tick_data["tick_volume"] = tick_vol
+            tick_data["day_progress"] = day_pct
+
+            # Notify subscribers
+            for callback in self._subscribers.get(symbol, []):
+                try:
+                    callback(tick_data)
+                except Exception:
+                    pass
+
+        return ticks
+
+    def _end_day(self, i: int, prev_close: int):
+        """Close out symbol ``i``'s replay day and set up the next one.
+
+        ``prev_close`` is the day's previous close in paisa.
         """
-        if progress < 0.25:
-            # Open → High
-            t = progress / 0.25
-            return open_p + (high_p - open_p) * t
-        elif progress < 0.50:
-            # High → Low
-            t = (progress - 0.25) / 0.25
-            return high_p + (low_p - high_p) * t
-        elif progress < 0.80:
-            # Low → Close
-            t = (progress - 0.50) / 0.30
-            return low_p + (close_p - low_p) * t
+        symbol = self._symbols[i]
+        replay = self._replay[symbol]
+
+        # Snap to exact close price at end of day
+        day_close = float(self._day_close[i])
+        close = int(_to_paisa(day_close))
+        self._price[i] = close
+        self._change[i] = change = close - prev_close
+        self._change_pct[i] = round((change / prev_close) * 100, 2) if prev_close else 0.0
+
+        self._day_index[i] += 1
+        self._tick_index[i] = 0
+
+        # Set up next day
+        if self._day_index[i] < self._window_len[i]:
+            next_day = replay["window"][self._day_index[i]]
+            self._start_day(i, close)
+            logger.info(
+                f"{symbol}: Day {self._day_index[i]}/{len(replay['window'])} "
+                f"({next_day.get('date', '?')}), prev_close={day_close}"
+            )
         else:
-            # Settle at Close
-            t = (progress - 0.80) / 0.20
-            return close_p + (close_p - close_p) * t  # just close_p
+            # Window exhausted — pick new random window
+            self._advance_replay(symbol)
 
     def subscribe(self, symbol: str, callback: Callable[[dict], None]) -> None:
         symbol = symbol.upper()
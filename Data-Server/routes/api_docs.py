@@ -0,0 +1,341 @@
+"""Swagger specs for the REST endpoints, registered once as the flasgger template.
+
+Keeping the specs here rather than as YAML in each view docstring means
+flasgger has nothing to parse when it builds /apispec_1.json.
+"""
+
+API_PATHS = {
+    "/api/health": {
+        "get": {
+            "summary": "Server health check",
+            "tags": ["System"],
+            "responses": {
+                200: {
+                    "description": "Server is running",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "status": {"type": "string", "example": "ok"},
+                            "service": {"type": "string", "example": "stocklearn-data-server"},
+                        },
+                    },
+                },
+            },
+        },
+    },
+    "/api/stocks": {
+        "get": {
+            "summary": "List tracked NEPSE stocks with live simulated prices",
+            "tags": ["Stocks"],
+            "parameters": [
+                {
+                    "name": "all",
+                    "in": "query",
+                    "type": "string",
+                    "enum": ["true", "false"],
+                    "default": "false",
+                    "description": (
+                        "Set to 'true' to list all 616 available stocks instead of just tracked ones"
+                    ),
+                },
+            ],
+            "responses": {
+                200: {
+                    "description": "List of stocks with current prices",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "count": {"type": "integer", "example": 12},
+                            "stocks": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "symbol": {"type": "string", "example": "NABIL"},
+                                        "name": {
+                                            "type": "string",
+                                            "example": "Nabil Bank Limited",
+                                        },
+                                        "sector": {"type": "string", "example": "Commercial Bank"},
+                                        "price": {"type": "number", "example": 507.0},
+                                        "change": {"type": "number", "example": -2.5},
+                                        "change_pct": {"type": "number", "example": -0.49},
+                                        "volume": {"type": "integer", "example": 18121},
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+    "/api/stocks/{symbol}": {
+        "get": {
+            "summary": "Get current price data for a specific stock",
+            "tags": ["Stocks"],
+            "parameters": [
+                {
+                    "name": "symbol",
+                    "in": "path",
+                    "type": "string",
+                    "required": True,
+                    "description": "Stock symbol (e.g. NABIL, UPPER, SCB)",
+                },
+            ],
+            "responses": {
+                200: {
+                    "description": "Stock info with current tick data",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "symbol": {"type": "string", "example": "NABIL"},
+                            "name": {"type": "string", "example": "Nabil Bank Limited"},
+                            "sector": {"type": "string", "example": "Commercial Bank"},
+                            "tick": {
+                                "type": "object",
+                                "properties": {
+                                    "price": {"type": "number", "example": 507.0},
+                                    "open": {"type": "number", "example": 511.0},
+                                    "high": {"type": "number", "example": 511.0},
+                                    "low": {"type": "number", "example": 505.0},
+                                    "prev_close": {"type": "number", "example": 507.1},
+                                    "volume": {"type": "integer", "example": 18121},
+                                    "change": {"type": "number", "example": -0.1},
+                                    "change_pct": {"type": "number", "example": -0.02},
+                                    "replay_date": {"type": "string", "example": "2025-11-19"},
+                                    "replay_day": {"type": "integer", "example": 3},
+                                    "replay_total_days": {"type": "integer", "example": 7},
+                                },
+                            },
+                        },
+                    },
+                },
+                404: {"description": "Stock not found"},
+            },
+        },
+    },
+    "/api/stocks/{symbol}/history": {
+        "get": {
+            "summary": "Get real historical OHLCV data for a stock",
+            "tags": ["Stocks"],
+            "parameters": [
+                {
+                    "name": "symbol",
+                    "in": "path",
+                    "type": "string",
+                    "required": True,
+                    "description": "Stock symbol (e.g. NABIL)",
+                },
+                {
+                    "name": "days",
+                    "in": "query",
+                    "type": "integer",
+                    "default": 50,
+                    "description": "Number of most recent trading days to return",
+                },
+                {
+                    "name": "orient",
+                    "in": "query",
+                    "type": "string",
+                    "enum": ["records", "columns"],
+                    "default": "records",
+                    "description": (
+                        "'columns' returns one array per field instead of one object per day"
+                    ),
+                },
+            ],
+            "responses": {
+                200: {
+                    "description": "Historical OHLCV data in chronological order",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "symbol": {"type": "string"},
+                            "name": {"type": "string"},
+                            "period_days": {"type": "integer"},
+                            "count": {"type": "integer"},
+                            "data": {
+                                "description": (
+                                    "One object per day; with orient=columns, one array per field"
+                                ),
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "date": {"type": "string", "example": "2025-11-19"},
+                                        "open": {"type": "number", "example": 511.0},
+                                        "high": {"type": "number", "example": 511.0},
+                                        "low": {"type": "number", "example": 505.0},
+                                        "close": {"type": "number", "example": 507.0},
+                                        "volume": {"type": "integer", "example": 18121},
+                                        "turnover": {"type": "number", "example": 9178167.3},
+                                        "change_pct": {"type": "number", "example": -0.02},
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+                404: {"description": "Stock not found"},
+            },
+        },
+    },
+    "/api/market/status": {
+        "get": {
+            "summary": "Get current NEPSE market open/close status",
+            "tags": ["Market"],
+            "responses": {
+                200: {
+                    "description": "Market status info",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "is_open": {"type": "boolean", "example": True},
+                            "current_time_npt": {
+                                "type": "string",
+                                "example": "2025-11-19 13:30:00",
+                            },
+                            "trading_hours": {"type": "string", "example": "11:00 - 15:00 NPT"},
+                            "trading_days": {"type": "string", "example": "Sunday - Thursday"},
+                            "force_open": {"type": "boolean", "example": True},
+                            "is_trading_day": {"type": "boolean", "example": True},
+                            "is_within_hours": {"type": "boolean", "example": True},
+                        },
+                    },
+                },
+            },
+        },
+    },
+    "/api/stocks/search": {
+        "get": {
+            "summary": "Search for stocks by symbol or company name",
+            "tags": ["Stocks"],
+            "parameters": [
+                {
+                    "name": "q",
+                    "in": "query",
+                    "type": "string",
+                    "description": (
+                        "Search query — matches symbol or company name (e.g. 'NAB', 'Himalayan')"
+                    ),
+                },
+                {
+                    "name": "sector",
+                    "in": "query",
+                    "type": "string",
+                    "description": "Filter by sector (e.g. 'Commercial Bank', 'Hydropower')",
+                },
+            ],
+            "responses": {
+                200: {
+                    "description": "Matching stocks (max 50 results)",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "count": {"type": "integer"},
+                            "results": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "symbol": {"type": "string", "example": "NABIL"},
+                                        "name": {
+                                            "type": "string",
+                                            "example": "Nabil Bank Limited",
+                                        },
+                                        "sector": {"type": "string", "example": "Commercial Bank"},
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+    "/api/alerts/check": {
+        "post": {
+            "summary": "Check if a stock currently exceeds a given spike threshold",
+            "tags": ["Alerts"],
+            "parameters": [
+                {
+                    "name": "body",
+                    "in": "body",
+                    "required": True,
+                    "schema": {
+                        "type": "object",
+                        "required": ["symbol"],
+                        "properties": {
+                            "symbol": {
+                                "type": "string",
+                                "description": "Stock symbol to check",
+                                "example": "NABIL",
+                            },
+                            "price_threshold_pct": {
+                                "type": "number",
+                                "description": "Price change percentage threshold",
+                                "example": 3.0,
+                            },
+                            "volume_threshold_multiplier": {
+                                "type": "number",
+                                "description": "Volume spike multiplier above average",
+                                "example": 2.0,
+                            },
+                        },
+                    },
+                },
+            ],
+            "responses": {
+                200: {
+                    "description": "Alert check result with current tick and any triggered alerts",
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "symbol": {"type": "string"},
+                            "current_tick": {"type": "object"},
+                            "alert_count": {"type": "integer"},
+                            "alerts": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "alert_type": {
+                                            "type": "string",
+                                            "enum": ["price", "volume"],
+                                        },
+                                        "direction": {
+                                            "type": "string",
+                                            "enum": ["up", "down"],
+                                        },
+                                        "magnitude": {"type": "number"},
+                                        "current_value": {"type": "number"},
+                                        "threshold": {"type": "number"},
+                                        "reference_value": {"type": "number"},
+                                        "symbol": {"type": "string"},
+                                        "timestamp": {"type": "string"},
+                                    },
+                                },
+                            },
+                            "recommendation": {
+                                "type": "object",
+                                "properties": {
+                                    "action": {"type": "string", "example": "watch"},
+                                    "confidence": {"type": "number", "example": 0.82},
+                                    "risk_level": {"type": "string", "example": "medium"},
+                                    "score": {"type": "number", "example": 0.64},
+                                    "reasons": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+                400: {"description": "Missing required field (symbol)"},
+                404: {"description": "No data available for the stock"},
+            },
+        },
+    },
+}
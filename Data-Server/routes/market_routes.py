@@ -1,9 +1,17 @@
-"""REST API endpoints for stock market data and alerts, with Swagger docs."""
+"""REST API endpoints for stock market data and alerts (Swagger specs in api_docs)."""
 
-from flask import Blueprint, jsonify, request
-from flasgger import swag_from
+from flask import Blueprint, request
 
-from data.stock_registry import get_all_symbols, get_stock_info, get_tracked_symbols
+from data.stock_registry import (
+    canonical_symbol,
+    get_all_symbols,
+    get_stock_info,
+    get_stock_infos,
+    get_tracked_symbols,
+    search_stocks as search_registry,
+)
+from detection.spike_detector import SpikeDetector
+from utils.fastjson import json_response
 
 market_bp = Blueprint("market", __name__)
 
@@ -12,66 +20,24 @@ _provider = None
 _clock = None
 _alert_manager = None
 _alert_advisor = None
+_detector = None
 
 
-def init_market_routes(provider, clock, alert_manager, alert_advisor=None):
+def init_market_routes(provider, clock, alert_manager, alert_advisor=None, detector=None):
     """Initialize route dependencies (called from server.py)."""
-    global _provider, _clock, _alert_manager, _alert_advisor
+    global _provider, _clock, _alert_manager, _alert_advisor, _detector
     _provider = provider
     _clock = clock
     _alert_manager = alert_manager
     _alert_advisor = alert_advisor
+    if detector is None:
+        detector = alert_manager.detector if alert_manager else SpikeDetector()
+    _detector = detector
 
 
 @market_bp.route("/api/stocks", methods=["GET"])
 def list_stocks():
-    """List tracked NEPSE stocks with live simulated prices
-    ---
-    tags:
-      - Stocks
-    parameters:
-      - name: all
-        in: query
-        type: string
-        enum: ['true', 'false']
-        default: 'false'
-        description: Set to 'true' to list all 616 available stocks instead of just tracked ones
-    responses:
-      200:
-        description: List of stocks with current prices
-        schema:
-          type: object
-          properties:
-            count:
-              type: integer
-              example: 12
-            stocks:
-              type: array
-              items:
-                type: object
-                properties:
-                  symbol:
-                    type: string
-                    example: NABIL
-                  name:
-                    type: string
-                    example: Nabil Bank Limited
-                  sector:
-                    type: string
-                    example: Commercial Bank
-                  price:
-                    type: number
-                    example: 507.0
-                  change:
-                    type: number
-                    example: -2.5
-                  change_pct:
-                    type: number
-                    example: -0.49
-                  volume:
-                    type: integer
-                    example: 18121
-    """
+    """List tracked NEPSE stocks with live simulated prices"""
     show_all = request.args.get("all", "false").lower() == "true"
 
     if show_all:
@@ -79,96 +45,47 @@ def list_stocks():
     else:
         symbols = _provider.get_available_symbols() if _provider else get_tracked_symbols()
 
-    stocks = []
-    for symbol in symbols:
-        info = get_stock_info(symbol) or {}
-        tick = _provider.get_latest_tick(symbol) if _provider else None
+    infos = get_stock_infos(symbols)
+    ticks = _provider.get_latest_ticks(symbols) if _provider else {}
+    stocks = [_stock_row(symbol, infos.get(symbol), ticks.get(symbol)) for symbol in symbols]
+    return json_response({"stocks": stocks, "count": len(stocks)})
+
 
-        stocks.append({
+def _stock_row(symbol: str, info, tick) -> dict:
+    """One /api/stocks entry from registry info and the latest tick."""
+    info = info or {}
+    if not tick:
+        return {
             "symbol": symbol,
             "name": info.get("name", symbol),
             "sector": info.get("sector", "Unknown"),
-            "price": tick["price"] if tick else info.get("ltp", 0),
-            "change": tick.get("change", 0) if tick else 0,
-            "change_pct": tick.get("change_pct", 0) if tick else 0,
-            "volume": tick.get("volume", 0) if tick else 0,
-        })
-    return jsonify({"stocks": stocks, "count": len(stocks)})
+            "price": info.get("ltp", 0),
+            "change": 0,
+            "change_pct": 0,
+            "volume": 0,
+        }
+    return {
+        "symbol": symbol,
+        "name": info.get("name", symbol),
+        "sector": info.get("sector", "Unknown"),
+        "price": tick["price"],
+        "change": tick.get("change", 0),
+        "change_pct": tick.get("change_pct", 0),
+        "volume": tick.get("volume", 0),
+    }
 
 
 @market_bp.route("/api/stocks/<symbol>", methods=["GET"])
 def get_stock(symbol: str):
-    """Get current price data for a specific stock
-    ---
-    tags:
-      - Stocks
-    parameters:
-      - name: symbol
-        in: path
-        type: string
-        required: true
-        description: Stock symbol (e.g. NABIL, UPPER, SCB)
-    responses:
-      200:
-        description: Stock info with current tick data
-        schema:
-          type: object
-          properties:
-            symbol:
-              type: string
-              example: NABIL
-            name:
-              type: string
-              example: Nabil Bank Limited
-            sector:
-              type: string
-              example: Commercial Bank
-            tick:
-              type: object
-              properties:
-                price:
-                  type: number
-                  example: 507.0
-                open:
-                  type: number
-                  example: 511.0
-                high:
-                  type: number
-                  example: 511.0
-                low:
-                  type: number
-                  example: 505.0
-                prev_close:
-                  type: number
-                  example: 507.1
-                volume:
-                  type: integer
-                  example: 18121
-                change:
-                  type: number
-                  example: -0.1
-                change_pct:
-                  type: number
-                  example: -0.02
-                replay_date:
-                  type: string
-                  example: '2025-11-19'
-                replay_day:
-                  type: integer
-                  example: 3
-                replay_total_days:
-                  type: integer
-                  example: 7
-      404:
-        description: Stock not found
-    """
-    symbol = symbol.upper()
-    info = get_stock_info(symbol)
+    """Get current price data for a specific stock"""
+    canonical = canonical_symbol(symbol)
+    info = get_stock_info(canonical) if canonical else None
     if not info:
-        return jsonify({"error": f"Stock '{symbol}' not found"}), 404
+        return json_response({"error": f"Stock '{symbol.upper()}' not found"}, 404)
+    symbol = canonical
 
     tick = _provider.get_latest_tick(symbol) if _provider else None
-    return jsonify({
+    return json_response({
         "symbol": symbol,
         "name": info.get("name", symbol),
         "sector": info.get("sector", "Unknown"),
@@ -178,290 +95,58 @@ def get_stock(symbol: str):
 
 @market_bp.route("/api/stocks/<symbol>/history", methods=["GET"])
 def get_stock_history(symbol: str):
-    """Get real historical OHLCV data for a stock
-    ---
-    tags:
-      - Stocks
-    parameters:
-      - name: symbol
-        in: path
-        type: string
-        required: true
-        description: Stock symbol (e.g. NABIL)
-      - name: days
-        in: query
-        type: integer
-        default: 50
-        description: Number of most recent trading days to return
-    responses:
-      200:
-        description: Historical OHLCV data in chronological order
-        schema:
-          type: object
-          properties:
-            symbol:
-              type: string
-            name:
-              type: string
-            period_days:
-              type: integer
-            count:
-              type: integer
-            data:
-              type: array
-              items:
-                type: object
-                properties:
-                  date:
-                    type: string
-                    example: '2025-11-19'
-                  open:
-                    type: number
-                    example: 511.0
-                  high:
-                    type: number
-                    example: 511.0
-                  low:
-                    type: number
-                    example: 505.0
-                  close:
-                    type: number
-                    example: 507.0
-                  volume:
-                    type: integer
-                    example: 18121
-                  turnover:
-                    type: number
-                    example: 9178167.3
-                  change_pct:
-                    type: number
-                    example: -0.02
-      404:
-        description: Stock not found
-    """
-    symbol = symbol.upper()
-    info = get_stock_info(symbol)
+    """Get real historical OHLCV data for a stock"""
+    canonical = canonical_symbol(symbol)
+    info = get_stock_info(canonical) if canonical else None
     if not info:
-        return jsonify({"error": f"Stock '{symbol}' not found"}), 404
+        return json_response({"error": f"Stock '{symbol.upper()}' not found"}, 404)
+    symbol = canonical
 
     days = request.args.get("days", 50, type=int)
-    history = _provider.get_history(symbol, days) if _provider else []
-    return jsonify({
+    if request.args.get("orient") == "columns":
+        history = _provider.get_history_columns(symbol, days) if _provider else {}
+        count = len(history.get("date", ()))
+    else:
+        history = _provider.get_history(symbol, days) if _provider else []
+        count = len(history)
+    return json_response({
         "symbol": symbol,
         "name": info.get("name", symbol),
         "period_days": days,
         "data": history,
-        "count": len(history),
+        "count": count,
     })
 
 
 @market_bp.route("/api/market/status", methods=["GET"])
 def market_status():
-    """Get current NEPSE market open/close status
-    ---
-    tags:
-      - Market
-    responses:
-      200:
-        description: Market status info
-        schema:
-          type: object
-          properties:
-            is_open:
-              type: boolean
-              example: true
-            current_time_npt:
-              type: string
-              example: '2025-11-19 13:30:00'
-            trading_hours:
-              type: string
-              example: '11:00 - 15:00 NPT'
-            trading_days:
-              type: string
-              example: Sunday - Thursday
-            force_open:
-              type: boolean
-              example: true
-            is_trading_day:
-              type: boolean
-              example: true
-            is_within_hours:
-              type: boolean
-              example: true
-    """
+    """Get current NEPSE market open/close status"""
     if not _clock:
-        return jsonify({"error": "Market clock not initialized"}), 500
-    return jsonify(_clock.get_market_status())
+        return json_response({"error": "Market clock not initialized"}, 500)
+    return json_response(_clock.get_market_status())
 
 
 @market_bp.route("/api/stocks/search", methods=["GET"])
 def search_stocks():
-    """Search for stocks by symbol or company name
-    ---
-    tags:
-      - Stocks
-    parameters:
-      - name: q
-        in: query
-        type: string
-        description: Search query — matches symbol or company name (e.g. 'NAB', 'Himalayan')
-      - name: sector
-        in: query
-        type: string
-        description: Filter by sector (e.g. 'Commercial Bank', 'Hydropower')
-    responses:
-      200:
-        description: Matching stocks (max 50 results)
-        schema:
-          type: object
-          properties:
-            count:
-              type: integer
-            results:
-              type: array
-              items:
-                type: object
-                properties:
-                  symbol:
-                    type: string
-                    example: NABIL
-                  name:
-                    type: string
-                    example: Nabil Bank Limited
-                  sector:
-                    type: string
-                    example: Commercial Bank
-    """
-    query = request.args.get("q", "").upper().strip()
-    sector = request.args.get("sector", "").strip()
-
-    all_symbols = get_all_symbols()
-    results = []
-
-    for symbol in all_symbols:
-        info = get_stock_info(symbol) or {}
-        name = info.get("name", "").upper()
-        stock_sector = info.get("sector", "")
-
-        if query and query not in symbol and query not in name:
-            continue
-        if sector and sector.lower() not in stock_sector.lower():
-            continue
-
-        results.append({
-            "symbol": symbol,
-            "name": info.get("name", symbol),
-            "sector": stock_sector,
-        })
-
-        if len(results) >= 50:
-            break
-
-    return jsonify({"results": results, "count": len(results)})
+    """Search for stocks by symbol or company name"""
+    results = search_registry(request.args.get("q", ""), request.args.get("sector", ""))
+    return json_response({"results": results, "count": len(results)})
 
 
 @market_bp.route("/api/alerts/check", methods=["POST"])
 def check_alert_threshold():
-    """Check if a stock currently exceeds a given spike threshold
-    ---
-    tags:
-      - Alerts
-    parameters:
-      - name: body
-        in: body
-        required: true
-        schema:
-          type: object
-          required:
-            - symbol
-          properties:
-            symbol:
-              type: string
-              description: Stock symbol to check
-              example: NABIL
-            price_threshold_pct:
-              type: number
-              description: Price change percentage threshold
-              example: 3.0
-            volume_threshold_multiplier:
-              type: number
-              description: Volume spike multiplier above average
-              example: 2.0
-    responses:
-      200:
-        description: Alert check result with current tick and any triggered alerts
-        schema:
-          type: object
-          properties:
-            symbol:
-              type: string
-            current_tick:
-              type: object
-            alert_count:
-              type: integer
-            alerts:
-              type: array
-              items:
-                type: object
-                properties:
-                  alert_type:
-                    type: string
-                    enum: [price, volume]
-                  direction:
-                    type: string
-                    enum: [up, down]
-                  magnitude:
-                    type: number
-                  current_value:
-                    type: number
-                  threshold:
-                    type: number
-                  reference_value:
-                    type: number
-                  symbol:
-                    type: string
-                  timestamp:
-                    type: string
-            recommendation:
-              type: object
-              properties:
-                action:
-                  type: string
-                  example: watch
-                confidence:
-                  type: number
-                  example: 0.82
-                risk_level:
-                  type: string
-                  example: medium
-                score:
-                  type: number
-                  example: 0.64
-                reasons:
-                  type: array
-                  items:
-                    type: string
-      400:
-        description: Missing required field (symbol)
-      404:
-        description: No data available for the stock
-    """
-    data = request.get_json()
-    if not data or "symbol" not in data:
-        return jsonify({"error": "symbol is required"}), 400
+    """Check if a stock currently exceeds a given spike threshold"""
+    # One-shot body: don't keep the parsed copy, and treat bad JSON as missing
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict) or not isinstance(data.get("symbol"), str):
+        return json_response({"error": "symbol is required"}, 400)
 
-    symbol = data["symbol"].upper()
+    symbol = canonical_symbol(data["symbol"]) or data["symbol"].upper()
     tick = _provider.get_latest_tick(symbol) if _provider else None
     if not tick:
-        return jsonify({"error": f"No data available for '{symbol}'"}), 404
-
-    detector = _alert_manager.detector if _alert_manager else None
-    if detector is None:
-        from detection.spike_detector import SpikeDetector
-
-        detector = SpikeDetector()
+        return json_response({"error": f"No data available for '{symbol}'"}, 404)
 
-    alerts = detector.analyze_tick(
+    alerts = _detector.analyze_tick(
         tick,
         price_threshold_pct=data.get("price_threshold_pct"),
         volume_threshold_multiplier=data.get("volume_threshold_multiplier"),
@@ -475,7 +160,7 @@ def check_alert_threshold():
             volume_threshold_multiplier=data.get("volume_threshold_multiplier"),
         ).to_dict()
 
-    return jsonify({
+    return json_response({
         "symbol": symbol,
         "current_tick": tick,
         "alerts": [a.to_dict() for a in alerts],
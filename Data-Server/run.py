@@ -11,15 +11,26 @@ import logging
 import sys
 import os
 
-# Enable eventlet monkey patching before importing Flask/Socket.IO internals.
+# Enable cooperative I/O (eventlet, else gevent) before importing Flask/Socket.IO
+# internals, so tick broadcasts multiplex over one reactor instead of a thread
+# per connection.
 EVENTLET_ENABLED = False
+GEVENT_ENABLED = False
 try:
     import eventlet  # type: ignore
 
     eventlet.monkey_patch()
     EVENTLET_ENABLED = True
 except Exception:
-    EVENTLET_ENABLED = False
+    try:
+        from gevent import monkey  # type: ignore
+
+        monkey.patch_all()
+        GEVENT_ENABLED = True
+    except Exception:
+        pass
+
+ASYNC_MODE = "eventlet" if EVENTLET_ENABLED else "gevent" if GEVENT_ENABLED else "threading"
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -36,14 +47,17 @@ from detection.spike_detector import SpikeDetector
 from engine.market_clock import MarketClock
 from engine.market_engine import MarketEngine
 from providers.provider_factory import create_provider
+from routes.api_docs import API_PATHS
 from routes.health_routes import health_bp
 from routes.market_routes import init_market_routes, market_bp
 from sockets.handlers import (
-    broadcast_alert,
+    broadcast_alerts,
     broadcast_market_status,
-    broadcast_ticks,
+    broadcast_room_ticks,
+    broadcast_tick_json,
     init_socket_handlers,
 )
+from utils.fastjson import FastJSONProvider, SocketJSON
 
 # ─── Logging Setup ───────────────────────────────────────────────────────────
 
@@ -60,6 +74,7 @@ def create_app() -> tuple:
 
     # ─── Flask App ────────────────────────────────────────────────────────────
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config["SECRET_KEY"] = "kjfngaskjdnfklajsbdlihh;acvkjn98e"
     CORS(app)  # Enable CORS for all routes
 
@@ -75,44 +90,49 @@ def create_app() -> tuple:
         "termsOfService": "",
         "specs_route": "/apidocs/",
     }
-    swagger = Swagger(app)
+    swagger = Swagger(app, template={"paths": API_PATHS})
 
     # ─── Socket.IO ────────────────────────────────────────────────────────────
     socketio = SocketIO(
         app,
         cors_allowed_origins=Config.CORS_ORIGIN,
-        async_mode="eventlet" if EVENTLET_ENABLED else "threading",
+        async_mode=ASYNC_MODE,
+        json=SocketJSON,
         logger=False,
         engineio_logger=False,
     )
-    logger.info(f"Socket.IO async mode: {socketio.async_mode}")
+    logger.info("Socket.IO async mode: %s", socketio.async_mode)
 
     # ─── Core Components ─────────────────────────────────────────────────────
     logger.info("Initializing Project Samridhha Data Server...")
 
     # 1. Data Provider (simulator or NEPSE API)
     provider = create_provider()
-    logger.info(f"Data provider: {Config.DATA_PROVIDER}")
+    logger.info("Data provider: %s", Config.DATA_PROVIDER)
 
     # 2. Market Clock (NEPSE hours)
     clock = MarketClock()
     market_status = clock.get_market_status()
     logger.info(
-        f"Market clock: {market_status['trading_hours']}, "
-        f"Force open: {clock.force_open}, "
-        f"Currently: {'OPEN' if market_status['is_open'] else 'CLOSED'}"
+        "Market clock: %s, Force open: %s, Currently: %s",
+        market_status["trading_hours"],
+        clock.force_open,
+        "OPEN" if market_status["is_open"] else "CLOSED",
     )
 
     # 3. Spike detector, advisory layer, and alert manager.
+    price_threshold_pct = Config.DEFAULT_PRICE_THRESHOLD_PCT
+    volume_threshold_multiplier = Config.DEFAULT_VOLUME_THRESHOLD_MULTIPLIER
     detector = SpikeDetector(
-        default_price_threshold_pct=Config.DEFAULT_PRICE_THRESHOLD_PCT,
-        default_volume_threshold_multiplier=Config.DEFAULT_VOLUME_THRESHOLD_MULTIPLIER,
+        default_price_threshold_pct=price_threshold_pct,
+        default_volume_threshold_multiplier=volume_threshold_multiplier,
     )
     alert_advisor = AlertAdvisor(detector=detector)
     alert_manager = AlertManager(detector=detector)
     logger.info(
-        f"Spike detector: price≥{Config.DEFAULT_PRICE_THRESHOLD_PCT}%, "
-        f"volume≥{Config.DEFAULT_VOLUME_THRESHOLD_MULTIPLIER}x"
+        "Spike detector: price≥%s%%, volume≥%sx",
+        price_threshold_pct,
+        volume_threshold_multiplier,
     )
 
     # 4. Market Engine
@@ -122,39 +142,45 @@ def create_app() -> tuple:
 
     # On every tick batch: run spike detection + broadcast
     def on_tick_batch(ticks: dict):
-        # Broadcast raw ticks
-        broadcast_ticks(socketio, ticks)
+        # Broadcast raw ticks to stock rooms (the full batch goes out as JSON below)
+        broadcast_room_ticks(socketio, ticks)
 
-        # Run spike detection against all user subscriptions
-        triggered = alert_manager.process_ticks(ticks)
-        for entry in triggered:
-            broadcast_alert(socketio, entry["user_id"], entry["alert"])
+        # Run spike detection against all user subscriptions; triggered
+        # alerts are broadcast by the alert manager listener below
+        arrays = provider.tick_arrays() if hasattr(provider, "tick_arrays") else None
+        alert_manager.process_ticks(ticks, arrays)
 
     engine.on_tick(on_tick_batch)
 
+    # Full batch to every client, reusing the engine's single JSON encoding
+    def on_tick_json(payload: bytes):
+        broadcast_tick_json(socketio, payload)
+
+    engine.on_tick_json(on_tick_json)
+
     # On market status change
     def on_market_status(event: dict):
         broadcast_market_status(socketio, event)
 
     engine.on_market_status_change(on_market_status)
 
-    # Alert manager callback — broadcast individual alerts
-    def on_alert_triggered(user_id: str, alert):
-        broadcast_alert(socketio, user_id, alert)
+    # Alert manager callback — broadcast each batch of triggered alerts
+    def on_alerts_triggered(alerts: list):
+        broadcast_alerts(socketio, alerts)
 
-    alert_manager.on_alert(on_alert_triggered)
+    alert_manager.on_alert(on_alerts_triggered)
 
     # ─── Register Routes & Socket Handlers ───────────────────────────────────
     app.register_blueprint(health_bp)
     app.register_blueprint(market_bp)
-    init_market_routes(provider, clock, alert_manager, alert_advisor=alert_advisor)
+    init_market_routes(
+        provider, clock, alert_manager, alert_advisor=alert_advisor, detector=detector
+    )
     init_socket_handlers(socketio, provider, alert_manager)
 
     # ─── Start Engine ────────────────────────────────────────────────────────
     engine.start()
-    logger.info(
-        f"Market engine started (tick interval: {Config.TICK_INTERVAL_SECONDS}s)"
-    )
+    logger.info("Market engine started (tick interval: %ss)", Config.TICK_INTERVAL_SECONDS)
 
     return app, socketio, engine
 
@@ -165,9 +191,10 @@ def main():
 
     logger.info("=" * 60)
     logger.info("  Project Samridhha Data Server")
-    logger.info(f"  http://{Config.HOST}:{Config.PORT}")
-    logger.info(f"  Swagger: http://{Config.HOST}:{Config.PORT}/apidocs")
-    logger.info(f"  WebSocket: ws://{Config.HOST}:{Config.PORT}")
+    host, port = Config.HOST, Config.PORT
+    logger.info("  http://%s:%s", host, port)
+    logger.info("  Swagger: http://%s:%s/apidocs", host, port)
+    logger.info("  WebSocket: ws://%s:%s", host, port)
     logger.info("=" * 60)
 
     try:
@@ -177,8 +204,8 @@ def main():
 
         socketio.run(
             app,
-            host=Config.HOST,
-            port=Config.PORT,
+            host=host,
+            port=port,
             debug=Config.DEBUG,
             use_reloader=False,  # Don't reload — engine thread stays alive
             **run_kwargs,
@@ -1,8 +1,14 @@
 """WebSocket event handlers for real-time market data broadcasting."""
 
 import logging
+import threading
+from typing import Dict, Iterable, Optional, Set
 
-from flask_socketio import SocketIO, emit, join_room, leave_room
+from flask import request
+from flask_socketio import SocketIO, emit
+
+from data.stock_registry import canonical_symbol
+from utils.fastjson import RawJSON, dumps
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +16,85 @@ logger = logging.getLogger(__name__)
 _alert_manager = None
 _provider = None
 
+# Connected clients and stock-room membership (mirrored from join/leave calls)
+# so broadcasts can skip idle emits: symbol -> subscribed client count,
+# sid -> symbols.
+_room_lock = threading.Lock()
+_client_count = 0
+_room_counts: Dict[str, int] = {}
+_client_symbols: Dict[str, Set[str]] = {}
+# sid -> user whose alert room the client is in
+_client_users: Dict[str, str] = {}
+
+
+def _track_join(sid: str, symbols: Iterable[str]):
+    with _room_lock:
+        joined = _client_symbols.setdefault(sid, set())
+        for symbol in symbols:
+            if symbol not in joined:
+                joined.add(symbol)
+                _room_counts[symbol] = _room_counts.get(symbol, 0) + 1
+
+
+def _track_leave(sid: str, symbols: Optional[Iterable[str]] = None):
+    """Forget sid's membership of symbols (all of them when None)."""
+    with _room_lock:
+        joined = _client_symbols.get(sid)
+        if not joined:
+            return
+        for symbol in list(joined) if symbols is None else symbols:
+            if symbol in joined:
+                joined.discard(symbol)
+                if _room_counts[symbol] <= 1:
+                    del _room_counts[symbol]
+                else:
+                    _room_counts[symbol] -= 1
+        if not joined:
+            del _client_symbols[sid]
+
+
+def _enter_stock_rooms(socketio: SocketIO, symbols: Iterable[str]):
+    """Put the requesting client in the room of every symbol in one pass.
+
+    Equivalent to calling join_room per symbol, but resolves the client
+    and the room manager once instead of once per room.
+    """
+    manager = socketio.server.manager
+    sid, namespace = request.sid, request.namespace
+    eio_sid = manager.eio_sid_from_sid(sid, namespace)
+    for symbol in symbols:
+        manager.enter_room(sid, namespace, f"stock:{symbol}", eio_sid=eio_sid)
+
+
+def _leave_stock_rooms(socketio: SocketIO, symbols: Iterable[str]):
+    """Take the requesting client out of the room of every symbol."""
+    manager = socketio.server.manager
+    sid, namespace = request.sid, request.namespace
+    for symbol in symbols:
+        manager.leave_room(sid, namespace, f"stock:{symbol}")
+
+
+def _user_room(user_id: str) -> str:
+    """Room that receives the alerts of one user."""
+    return f"user:{user_id}"
+
+
+def _bind_user(socketio: SocketIO, user_id: str):
+    """Move the requesting client into user_id's alert room.
+
+    A client is in at most one user room: the previous one is left first.
+    """
+    sid, namespace = request.sid, request.namespace
+    with _room_lock:
+        previous = _client_users.get(sid)
+        _client_users[sid] = user_id
+    if previous == user_id:
+        return
+    manager = socketio.server.manager
+    if previous is not None:
+        manager.leave_room(sid, namespace, _user_room(previous))
+    manager.enter_room(sid, namespace, _user_room(user_id))
+
 
 def init_socket_handlers(socketio: SocketIO, provider, alert_manager):
     """Register all WebSocket event handlers."""
@@ -18,7 +103,14 @@ def init_socket_handlers(socketio: SocketIO, provider, alert_manager):
     _provider = provider
 
     @socketio.on("connect")
-    def handle_connect():
+    def handle_connect(auth=None):
+        """Clients may pass { "user_id": ... } as Socket.IO auth to get that user's alerts."""
+        global _client_count
+        with _room_lock:
+            _client_count += 1
+        user_id = auth.get("user_id") if isinstance(auth, dict) else None
+        if user_id and isinstance(user_id, str):
+            _bind_user(socketio, user_id)
         logger.info("Client connected")
         emit("server:welcome", {
             "message": "Connected to Data Server WS",
@@ -31,19 +123,41 @@ def init_socket_handlers(socketio: SocketIO, provider, alert_manager):
 
     @socketio.on("disconnect")
     def handle_disconnect():
+        global _client_count
+        with _room_lock:
+            _client_count -= 1
+        _track_leave(request.sid)
+        with _room_lock:
+            _client_users.pop(request.sid, None)
         logger.info("Client disconnected")
 
+    @socketio.on("authenticate")
+    def handle_authenticate(data):
+        """Receive alerts for a user (instead of any user set before).
+
+        The user_id is taken as given, like everywhere else in this server;
+        it scopes alert delivery rather than proving identity.
+
+        Data: { "user_id": "abc123" }
+        """
+        user_id = data.get("user_id")
+        if not user_id or not isinstance(user_id, str):
+            emit("error", {"message": "user_id is required"})
+            return
+        _bind_user(socketio, user_id)
+        emit("authenticated", {"user_id": user_id})
+
     @socketio.on("subscribe:stock")
     def handle_subscribe_stock(data):
         """Subscribe to tick updates for specific stocks.
 
         Data: { "symbols": ["NABIL", "UPPER"] }
         """
-        symbols = data.get("symbols", [])
-        for symbol in symbols:
-            join_room(f"stock:{symbol.upper()}")
-            logger.info(f"Client subscribed to stock:{symbol.upper()}")
-        emit("subscribed", {"symbols": [s.upper() for s in symbols]})
+        symbols = [canonical_symbol(s) or s.upper() for s in data.get("symbols", [])]
+        _enter_stock_rooms(socketio, symbols)
+        logger.info("Client subscribed to %d stocks: %s", len(symbols), symbols)
+        _track_join(request.sid, symbols)
+        emit("subscribed", {"symbols": symbols})
 
     @socketio.on("unsubscribe:stock")
     def handle_unsubscribe_stock(data):
@@ -51,10 +165,10 @@ def init_socket_handlers(socketio: SocketIO, provider, alert_manager):
 
         Data: { "symbols": ["NABIL"] }
         """
-        symbols = data.get("symbols", [])
-        for symbol in symbols:
-            leave_room(f"stock:{symbol.upper()}")
-        emit("unsubscribed", {"symbols": [s.upper() for s in symbols]})
+        symbols = [canonical_symbol(s) or s.upper() for s in data.get("symbols", [])]
+        _leave_stock_rooms(socketio, symbols)
+        _track_leave(request.sid, symbols)
+        emit("unsubscribed", {"symbols": symbols})
 
     @socketio.on("set:threshold")
     def handle_set_threshold(data):
@@ -104,17 +218,38 @@ def init_socket_handlers(socketio: SocketIO, provider, alert_manager):
 
 
 def broadcast_ticks(socketio: SocketIO, ticks: dict):
-    """Broadcast tick updates to all connected clients and stock-specific rooms."""
-    # Broadcast all ticks to everyone
-    socketio.emit("tick:update", {"ticks": ticks})
+    """Broadcast tick updates to all connected clients and stock-specific rooms.
+
+    Encodes the batch once and goes through the same two helpers run.py
+    wires to the engine; socketio must be created with json=SocketJSON.
+    """
+    if not _client_count:
+        return
+    broadcast_tick_json(socketio, dumps(ticks))
+    broadcast_room_ticks(socketio, ticks)
+
+
+def broadcast_tick_json(socketio: SocketIO, payload: bytes):
+    """Broadcast a tick batch that is already encoded as JSON to all clients.
 
-    # Also broadcast to stock-specific rooms
-    for symbol, tick in ticks.items():
-        socketio.emit("tick:update", {"tick": tick}, room=f"stock:{symbol}")
+    The payload is spliced in without re-encoding; socketio must be
+    created with json=SocketJSON.
+    """
+    if not _client_count:
+        return
+    socketio.emit("tick:update", RawJSON(b'{"ticks":' + payload + b"}"))
+
+
+def broadcast_room_ticks(socketio: SocketIO, ticks: dict):
+    """Broadcast each tick to its stock room, skipping rooms without subscribers."""
+    with _room_lock:
+        symbols = [symbol for symbol in _room_counts if symbol in ticks]
+    for symbol in symbols:
+        socketio.emit("tick:update", {"tick": ticks[symbol]}, room=f"stock:{symbol}")
 
 
 def broadcast_alert(socketio: SocketIO, user_id: str, alert):
-    """Broadcast a triggered alert."""
+    """Send a triggered alert to the clients of the user it belongs to."""
     alert_payload = alert.to_dict() if hasattr(alert, "to_dict") else dict(alert)
     if "message" not in alert_payload:
         symbol = alert_payload.get("symbol", "Stock")
@@ -125,8 +260,14 @@ def broadcast_alert(socketio: SocketIO, user_id: str, alert):
         "user_id": user_id,
         "alert": alert_payload,
     }
-    socketio.emit("alert:triggered", alert_data)
-    logger.info(f"Alert broadcast: {alert_data['alert']['symbol']} - {alert_data['alert']['alert_type']}")
+    socketio.emit("alert:triggered", alert_data, room=_user_room(user_id))
+    logger.info("Alert broadcast: %s - %s", alert_payload["symbol"], alert_payload["alert_type"])
+
+
+def broadcast_alerts(socketio: SocketIO, alerts: list):
+    """Broadcast a batch of triggered (user_id, alert) pairs."""
+    for user_id, alert in alerts:
+        broadcast_alert(socketio, user_id, alert)
 
 
 def broadcast_market_status(socketio: SocketIO, status: dict):
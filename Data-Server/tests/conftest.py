@@ -0,0 +1,8 @@
+"""Shared pytest setup: make the Data-Server packages importable from tests/."""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
@@ -1,9 +1,6 @@
 """Tests for AI/ML-style alert advisor scoring."""
 
-import os
-import sys
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
 
 from detection.alert_advisor import AlertAdvisor
 from detection.spike_detector import SpikeDetector
@@ -47,3 +44,24 @@ def test_advisor_sell_signal_on_negative_spike():
     assert rec.action in {"sell", "watch"}
     assert rec.confidence >= 0.5
 
+
+def test_advisor_batch_matches_single_tick():
+    advisor = AlertAdvisor(detector=SpikeDetector())
+    ticks = [
+        {"symbol": "NABIL", "price": 1320.0, "open": 1260.0, "prev_close": 1250.0,
+         "volume": 120000, "avg_volume": 45000},
+        {"symbol": "UPPER", "price": 200.0, "open": 201.0, "prev_close": 200.5,
+         "volume": 1000, "avg_volume": 0},
+        {"symbol": "SCB", "price": 600.0, "open": 0.0, "prev_close": 0.0,
+         "volume": 0, "avg_volume": 5000},
+    ]
+
+    batch = advisor.recommend_batch(pd.DataFrame(ticks))
+
+    assert list(batch["symbol"]) == ["NABIL", "UPPER", "SCB"]
+    for row, tick in zip(batch.itertuples(), ticks):
+        single = advisor.recommend(tick)
+        assert row.action == single.action
+        assert row.risk_level == single.risk_level
+        assert abs(row.score - single.score) < 1e-12
+        assert abs(row.confidence - single.confidence) < 1e-12
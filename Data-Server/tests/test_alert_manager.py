@@ -0,0 +1,149 @@
+"""Tests for per-user alert subscriptions and tick processing."""
+
+import dataclasses
+import threading
+
+import pytest
+
+from detection.alert_manager import AlertManager
+from detection.spike_detector import SpikeDetector
+
+
+def _tick(symbol, price, prev_close, volume=1000, avg_volume=1000):
+    return {
+        "symbol": symbol,
+        "price": price,
+        "prev_close": prev_close,
+        "volume": volume,
+        "avg_volume": avg_volume,
+    }
+
+
+def test_process_ticks_matches_subscriptions():
+    """Only subscribed symbols crossing their own thresholds should alert."""
+    manager = AlertManager(detector=SpikeDetector())
+    manager.add_subscription("alice", "NABIL", price_threshold_pct=3.0)
+    manager.add_subscription("bob", "NABIL", price_threshold_pct=10.0)
+    manager.add_subscription("bob", "upper", price_threshold_pct=1.0)
+
+    ticks = {
+        "NABIL": _tick("NABIL", 1300.0, 1250.0),  # 4% move
+        "UPPER": _tick("UPPER", 200.5, 200.0),  # 0.25% move
+        "SCB": _tick("SCB", 700.0, 600.0),  # nobody subscribed
+    }
+    triggered = manager.process_ticks(ticks)
+
+    assert [(t["user_id"], t["alert"]["symbol"]) for t in triggered] == [("alice", "NABIL")]
+    assert triggered[0]["alert"]["alert_type"] == "price"
+
+
+def test_process_ticks_volume_and_cooldown():
+    """Alerts should fire once per cooldown window and per alert type."""
+    manager = AlertManager(detector=SpikeDetector())
+    manager.add_subscription("alice", "NABIL", volume_threshold_multiplier=2.0)
+
+    ticks = {"NABIL": _tick("NABIL", 1320.0, 1250.0, volume=120000, avg_volume=45000)}
+    first = manager.process_ticks(ticks)
+    assert {t["alert"]["alert_type"] for t in first} == {"price", "volume"}
+
+    assert manager.process_ticks(ticks) == []
+
+    manager.clear_cooldowns()
+    assert len(manager.process_ticks(ticks)) == 2
+
+
+def test_removed_subscription_stops_alerts():
+    manager = AlertManager(detector=SpikeDetector())
+    manager.add_subscription("alice", "NABIL")
+    assert manager.remove_subscription("alice", "nabil")
+
+    ticks = {"NABIL": _tick("NABIL", 1400.0, 1250.0)}
+    assert manager.process_ticks(ticks) == []
+    assert manager.get_subscriptions("alice") == []
+
+
+def test_disabled_subscription_stops_alerts():
+    """Disabling an existing subscription should stop it firing until re-enabled."""
+    manager = AlertManager(detector=SpikeDetector())
+    manager.add_subscription("alice", "NABIL")
+    manager.add_subscription("bob", "NABIL")
+    assert manager.set_subscription_enabled("alice", "nabil", False)
+    assert not manager.set_subscription_enabled("carol", "NABIL", False)
+
+    ticks = {"NABIL": _tick("NABIL", 1400.0, 1250.0)}
+    assert [t["user_id"] for t in manager.process_ticks(ticks)] == ["bob"]
+    assert manager.get_subscriptions("alice")[0]["enabled"] is False
+
+    manager.set_subscription_enabled("alice", "NABIL", True)
+    assert [t["user_id"] for t in manager.process_ticks(ticks)] == ["alice"]
+
+
+def test_swap_delete_keeps_other_rows_and_cooldowns():
+    """Removing a row moves the last one into its slot without losing state."""
+    manager = AlertManager(detector=SpikeDetector())
+    for user_id in ("alice", "bob", "carol"):
+        manager.add_subscription(user_id, "NABIL", price_threshold_pct=3.0)
+    ticks = {"NABIL": _tick("NABIL", 1300.0, 1250.0)}
+    assert len(manager.process_ticks(ticks)) == 3
+
+    manager.remove_subscription("alice", "NABIL")
+    manager.add_subscription("dave", "NABIL", price_threshold_pct=3.0)
+    assert [t["user_id"] for t in manager.process_ticks(ticks)] == ["dave"]
+
+    # Re-adding keeps the cooldown the subscription had when it was removed
+    manager.add_subscription("alice", "NABIL", price_threshold_pct=3.0)
+    assert manager.process_ticks(ticks) == []
+
+
+def test_listeners_receive_one_batch_per_tick():
+    manager = AlertManager(detector=SpikeDetector())
+    manager.add_subscription("alice", "NABIL")
+    manager.add_subscription("bob", "SCB")
+    batches = []
+    manager.on_alert(batches.append)
+
+    manager.process_ticks({
+        "NABIL": _tick("NABIL", 1300.0, 1250.0),
+        "SCB": _tick("SCB", 700.0, 600.0),
+    })
+    manager.process_ticks({"NABIL": _tick("NABIL", 1250.0, 1250.0)})
+
+    assert len(batches) == 1
+    assert [(user_id, alert.symbol) for user_id, alert in batches[0]] == [
+        ("alice", "NABIL"),
+        ("bob", "SCB"),
+    ]
+
+
+def test_subscriptions_are_read_only():
+    manager = AlertManager(detector=SpikeDetector())
+    sub = manager.add_subscription("alice", "NABIL")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        sub.enabled = False
+
+
+def test_subscription_changes_wait_for_the_screen_in_progress():
+    """Rows must not be swap-deleted while a tick batch is being screened."""
+    blocked = []
+
+    class RemovingDetector(SpikeDetector):
+        def analyze_tick(self, tick, **kwargs):
+            remover = threading.Thread(
+                target=manager.remove_subscription, args=("alice", "NABIL")
+            )
+            remover.start()
+            remover.join(timeout=0.05)
+            blocked.append(remover)
+            return super().analyze_tick(tick, **kwargs)
+
+    manager = AlertManager(detector=RemovingDetector())
+    manager.add_subscription("alice", "NABIL")
+    manager.add_subscription("bob", "NABIL")
+
+    triggered = manager.process_ticks({"NABIL": _tick("NABIL", 1400.0, 1250.0)})
+    assert [t["user_id"] for t in triggered] == ["alice", "bob"]
+    assert all(remover.is_alive() for remover in blocked)
+
+    for remover in blocked:
+        remover.join()
+    assert manager.get_subscriptions("alice") == []
@@ -1,19 +1,23 @@
 """Tests for the NEPSE market clock."""
 
-import sys
-import os
+import importlib.util
+from datetime import datetime, timedelta
+from unittest.mock import patch
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
 
-from datetime import datetime, timezone, timedelta
 from engine.market_clock import MarketClock, NPT
 
+requires_benchmark = pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None,
+    reason="pytest-benchmark is not installed",
+)
+
 
 def test_npt_timezone():
     """Verify NPT is UTC+5:45."""
     npt_offset = NPT.utcoffset(None)
     assert npt_offset == timedelta(hours=5, minutes=45), f"Expected UTC+5:45, got {npt_offset}"
-    print("  ✅ NPT timezone is UTC+5:45")
 
 
 def test_trading_days():
@@ -37,7 +41,29 @@ def test_trading_days():
     saturday = datetime(2025, 12, 6, 12, 0, tzinfo=NPT)
     assert not clock.is_trading_day(saturday), "Saturday should NOT be a trading day"
 
-    print("  ✅ Trading days are correctly Sun-Thu")
+
+def test_public_holidays():
+    """Configured MM-DD holidays should not be trading days."""
+    clock = MarketClock()
+    clock.holidays = {"12-07"}
+
+    assert not clock.is_trading_day(datetime(2025, 12, 7, 12, 0, tzinfo=NPT))
+    assert clock.is_trading_day(datetime(2025, 12, 8, 12, 0, tzinfo=NPT))
+    assert not clock.is_trading_day(datetime(2025, 12, 7, 14, 0, tzinfo=NPT))
+
+
+def test_schedule_changes_after_first_check():
+    """Changing holidays or trading days should apply to dates already checked."""
+    clock = MarketClock()
+    sunday = datetime(2025, 12, 7, 12, 0, tzinfo=NPT)
+    assert clock.is_trading_day(sunday)
+
+    clock.holidays = {"12-07"}
+    assert not clock.is_trading_day(sunday)
+
+    clock.holidays = set()
+    clock.trading_days = {0}  # Mondays only
+    assert not clock.is_trading_day(sunday)
 
 
 def test_trading_hours():
@@ -65,8 +91,6 @@ def test_trading_hours():
     at_close = datetime(2025, 12, 7, 15, 0, tzinfo=NPT)
     assert not clock.is_within_trading_hours(at_close), "15:00 should be outside hours"
 
-    print("  ✅ Trading hours are correctly 11:00-15:00 NPT")
-
 
 def test_force_market_open():
     """Verify FORCE_MARKET_OPEN overrides clock."""
@@ -76,7 +100,60 @@ def test_force_market_open():
 
     clock.force_open = False
     # Market may or may not be open depending on current time
-    print("  ✅ Force market open works correctly")
+
+
+def test_market_open_is_cached():
+    """Repeated checks within the cache window should not re-read the clock."""
+    clock = MarketClock()
+    clock.force_open = False
+    calls = []
+    clock.now_npt = lambda: calls.append(1) or datetime(2025, 12, 7, 12, 0, tzinfo=NPT)
+
+    assert clock.is_market_open()
+    assert clock.is_market_open()
+    assert len(calls) == 1
+
+    clock._open_cache = (0.0, False)  # expire the cache
+    assert clock.is_market_open()
+    assert len(calls) == 2
+
+
+def test_market_status_is_cached_per_second():
+    """Status polls within the same second should reuse one computed status."""
+    clock = MarketClock()
+    builds = []
+    build = clock._build_market_status
+    clock._build_market_status = lambda: builds.append(1) or build()
+
+    with patch("engine.market_clock.time_mod") as fake_time:
+        fake_time.time.return_value = 1_700_000_000.0
+        fake_time.monotonic.return_value = 0.0
+
+        first = clock.get_market_status()
+        first["is_open"] = None  # callers get copies
+        assert clock.get_market_status()["is_open"] is not None
+        assert len(builds) == 1
+
+        clock.force_open = not clock.force_open  # invalidates the cache
+        assert clock.get_market_status()["force_open"] == clock.force_open
+        assert len(builds) == 2
+
+        fake_time.time.return_value += 1
+        clock.get_market_status()
+        assert len(builds) == 3
+
+
+def test_market_status_fields_agree_at_open():
+    """A stale is_market_open() answer should not leak into the status."""
+    clock = MarketClock()
+    clock.force_open = False
+    clock.now_npt = lambda: datetime(2025, 12, 7, 10, 59, 59, tzinfo=NPT)
+    assert not clock.is_market_open()  # cached for MARKET_OPEN_CACHE_SECONDS
+
+    clock.now_npt = lambda: datetime(2025, 12, 7, 11, 0, 0, tzinfo=NPT)
+    status = clock.get_market_status()
+    assert status["is_within_hours"] and status["is_trading_day"]
+    assert status["is_open"]
 
 
 def test_market_status():
@@ -91,15 +168,23 @@ def test_market_status():
     for key in required_keys:
         assert key in status, f"Missing key: {key}"
 
-    print("  ✅ Market status contains all required fields")
 
+# Clock calls sit on the request and engine-loop paths; these track their cost.
+@requires_benchmark
+def test_is_trading_day_perf(benchmark):
+    clock = MarketClock()
+    sunday = datetime(2025, 12, 7, 12, 0, tzinfo=NPT)
+    assert benchmark(clock.is_trading_day, sunday)
 
-if __name__ == "__main__":
-    print("\n🕐 Market Clock Tests")
-    print("-" * 40)
-    test_npt_timezone()
-    test_trading_days()
-    test_trading_hours()
-    test_force_market_open()
-    test_market_status()
-    print("\n✅ All market clock tests passed!\n")
+
+@requires_benchmark
+def test_is_market_open_perf(benchmark):
+    clock = MarketClock()
+    clock.force_open = False
+    assert benchmark(clock.is_market_open) in (True, False)
+
+
+@requires_benchmark
+def test_market_status_perf(benchmark):
+    clock = MarketClock()
+    assert "is_open" in benchmark(clock.get_market_status)
@@ -0,0 +1,44 @@
+"""Tests for the market engine's tick fan-out."""
+
+import json
+
+from engine.market_clock import MarketClock
+from engine.market_engine import MarketEngine
+
+
+class _BatchProvider:
+    """Minimal provider exposing the simulator's batch API."""
+
+    def __init__(self):
+        self.batches = 0
+
+    def generate_all_ticks_batch(self):
+        self.batches += 1
+        return {"NABIL": {"symbol": "NABIL", "price": 1250.5, "volume": 100}}
+
+
+def test_tick_listeners_receive_batch_and_json():
+    provider = _BatchProvider()
+    engine = MarketEngine(provider, MarketClock())
+    seen, payloads = [], []
+    engine.on_tick(seen.append)
+    engine.on_tick_json(payloads.append)
+    engine.on_tick_json(payloads.append)
+
+    engine._generate_all_ticks()
+
+    assert provider.batches == 1
+    assert seen == [{"NABIL": {"symbol": "NABIL", "price": 1250.5, "volume": 100}}]
+    assert len(payloads) == 2 and payloads[0] is payloads[1]
+    assert json.loads(payloads[0]) == seen[0]
+
+
+def test_delta_listeners_fall_back_to_full_batch():
+    """Providers without tick_delta() send the whole batch to delta listeners."""
+    engine = MarketEngine(_BatchProvider(), MarketClock())
+    deltas = []
+    engine.on_tick_delta(deltas.append)
+
+    engine._generate_all_ticks()
+
+    assert deltas == [{"NABIL": {"symbol": "NABIL", "price": 1250.5, "volume": 100}}]
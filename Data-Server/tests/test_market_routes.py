@@ -0,0 +1,64 @@
+"""Tests for the REST market routes."""
+
+from flask import Flask
+
+from routes.market_routes import init_market_routes, market_bp
+
+TICK = {
+    "symbol": "NABIL",
+    "price": 520.0,
+    "prev_close": 500.0,
+    "open": 500.0,
+    "volume": 1000,
+    "avg_volume": 1000,
+    "change": 20.0,
+    "change_pct": 4.0,
+}
+
+
+class _OneTickProvider:
+    """Provider stub that only has a tick for NABIL."""
+
+    def get_available_symbols(self):
+        return ("NABIL", "SCB")
+
+    def get_latest_tick(self, symbol):
+        return dict(TICK) if symbol == "NABIL" else None
+
+    def get_latest_ticks(self, symbols):
+        return {s: TICK for s in symbols if s == "NABIL"}
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(market_bp)
+    init_market_routes(_OneTickProvider(), None, None)
+    return app.test_client()
+
+
+def test_list_stocks_uses_ticks_and_falls_back_to_ltp():
+    stocks = {s["symbol"]: s for s in _client().get("/api/stocks").get_json()["stocks"]}
+    assert stocks["NABIL"]["price"] == 520.0
+    assert stocks["NABIL"]["change_pct"] == 4.0
+    assert stocks["SCB"]["volume"] == 0
+    assert stocks["SCB"]["name"] != "SCB"  # registry metadata
+
+
+def test_get_stock_is_case_insensitive():
+    client = _client()
+    assert client.get("/api/stocks/nabil").get_json()["symbol"] == "NABIL"
+    response = client.get("/api/stocks/nope")
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Stock 'NOPE' not found"}
+
+
+def test_alert_check_validates_body():
+    client = _client()
+    for body in ("not json", "[]", '{"symbol": 5}', "{}"):
+        response = client.post("/api/alerts/check", data=body, content_type="application/json")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "symbol is required"}
+
+    result = client.post("/api/alerts/check", json={"symbol": "nabil"}).get_json()
+    assert result["symbol"] == "NABIL"
+    assert [a["alert_type"] for a in result["alerts"]] == ["price"]
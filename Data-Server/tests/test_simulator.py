@@ -0,0 +1,87 @@
+"""Tests for the replay-based market simulator."""
+
+from providers.simulator import TICKS_PER_DAY, SimulatorProvider
+
+SYMBOLS = ["NABIL", "SCB"]
+
+
+def test_batch_replays_day_to_close():
+    """A full day of batches should end exactly on each symbol's real close."""
+    provider = SimulatorProvider(SYMBOLS)
+    first_days = {s: provider._replay[s]["window"][0] for s in SYMBOLS}
+
+    for _ in range(TICKS_PER_DAY):
+        ticks = provider.generate_all_ticks_batch()
+
+    assert set(ticks) == set(SYMBOLS)
+    for symbol, tick in ticks.items():
+        day = first_days[symbol]
+        assert tick["price"] == round(day["close"], 2)
+        assert tick["prev_close"] == day["close"]
+        assert tick["day_progress"] == 100.0
+
+
+def test_single_tick_updates_latest_state():
+    provider = SimulatorProvider(SYMBOLS)
+    tick = provider.generate_tick("nabil")
+
+    latest = provider.get_latest_tick("NABIL")
+    assert tick["tick_volume"] >= 1
+    assert {k: v for k, v in tick.items() if k not in ("tick_volume", "day_progress")} == latest
+    assert latest["volume"] == tick["tick_volume"]
+    assert provider.get_latest_tick("SCB")["volume"] == 0
+
+
+def test_emitted_ticks_reuse_buffers():
+    """Emitted ticks are per-symbol buffers; get_latest_tick hands out copies."""
+    provider = SimulatorProvider(SYMBOLS)
+    first = provider.generate_tick("NABIL")
+    second = provider.generate_all_ticks_batch()["NABIL"]
+
+    assert first is second
+    assert provider.get_latest_tick("NABIL") is not second
+
+
+def test_tick_delta_reports_only_moved_symbols():
+    provider = SimulatorProvider(SYMBOLS)
+    ticks = provider.generate_all_ticks_batch()
+
+    assert set(provider.tick_delta(ticks)) == set(SYMBOLS)
+    assert provider.tick_delta(ticks) == {}
+
+
+def test_snapshot_view_tracks_latest_ticks():
+    provider = SimulatorProvider(SYMBOLS)
+    view = provider.snapshot_view()
+    ticks = provider.generate_all_ticks_batch()
+
+    assert set(view) == set(SYMBOLS)
+    assert view["NABIL"] is ticks["NABIL"]
+    assert view["NABIL"]["price"] == provider.get_latest_tick("NABIL")["price"]
+
+
+def test_reset_session_clears_intraday_fields():
+    """The snapshot right after a reset should not carry the last session's tick."""
+    provider = SimulatorProvider(SYMBOLS)
+    for _ in range(5):
+        provider.generate_all_ticks_batch()
+    provider.reset_session()
+
+    for tick in provider.snapshot_view().values():
+        assert tick["volume"] == 0
+        assert tick["tick_volume"] == 0
+        assert tick["day_progress"] == 0.0
+
+
+def test_tick_arrays_match_tick_dicts():
+    provider = SimulatorProvider(SYMBOLS)
+    for _ in range(5):
+        ticks = provider.generate_all_ticks_batch()
+    arrays = provider.tick_arrays()
+
+    for symbol, tick in ticks.items():
+        row = arrays.index[symbol]
+        assert arrays.price[row] == tick["price"]
+        assert arrays.prev_close[row] == tick["prev_close"]
+        assert arrays.volume[row] == tick["volume"]
+        assert arrays.avg_volume[row] == tick["avg_volume"]
@@ -0,0 +1,115 @@
+"""Tests for the Socket.IO broadcast helpers."""
+
+from flask import Flask
+from flask_socketio import SocketIO
+
+from sockets import handlers
+from sockets.handlers import (
+    broadcast_alert,
+    broadcast_tick_json,
+    broadcast_ticks,
+    init_socket_handlers,
+)
+from utils.fastjson import SocketJSON, dumps
+
+TICKS = {"NABIL": {"symbol": "NABIL", "price": 510.0}, "SCB": {"symbol": "SCB", "price": 620.0}}
+
+
+def _make_server():
+    app = Flask(__name__)
+    socketio = SocketIO(app, async_mode="threading", json=SocketJSON)
+    init_socket_handlers(socketio, None, None)
+    return app, socketio
+
+
+def _tick_events(client):
+    return [m["args"][0] for m in client.get_received() if m["name"] == "tick:update"]
+
+
+def test_room_ticks_only_reach_subscribers():
+    app, socketio = _make_server()
+    subscriber = socketio.test_client(app)
+    other = socketio.test_client(app)
+    subscriber.emit("subscribe:stock", {"symbols": ["nabil"]})
+    subscriber.get_received()
+    other.get_received()
+
+    broadcast_ticks(socketio, TICKS)
+
+    assert _tick_events(subscriber) == [{"ticks": TICKS}, {"tick": TICKS["NABIL"]}]
+    assert _tick_events(other) == [{"ticks": TICKS}]
+    subscriber.disconnect()
+    other.disconnect()
+
+
+def test_unsubscribe_and_disconnect_release_rooms():
+    app, socketio = _make_server()
+    first = socketio.test_client(app)
+    second = socketio.test_client(app)
+    first.emit("subscribe:stock", {"symbols": ["NABIL", "SCB"]})
+    second.emit("subscribe:stock", {"symbols": ["SCB"]})
+    first.emit("unsubscribe:stock", {"symbols": ["NABIL"]})
+    first.disconnect()
+    second.get_received()
+
+    broadcast_ticks(socketio, TICKS)
+
+    assert _tick_events(second) == [{"ticks": TICKS}, {"tick": TICKS["SCB"]}]
+    second.disconnect()
+    assert handlers._room_counts == {}
+
+
+def test_pre_encoded_batch_matches_dict_broadcast():
+    app, socketio = _make_server()
+    client = socketio.test_client(app)
+    client.get_received()
+
+    broadcast_tick_json(socketio, dumps(TICKS))
+
+    assert _tick_events(client) == [{"ticks": TICKS}]
+    client.disconnect()
+
+
+def test_broadcasts_are_skipped_without_clients():
+    app, socketio = _make_server()
+    client = socketio.test_client(app)
+    client.disconnect()
+    assert handlers._client_count == 0
+
+    emitted = []
+    socketio.emit = lambda *args, **kwargs: emitted.append(args)
+    broadcast_ticks(socketio, TICKS)
+    broadcast_tick_json(socketio, dumps(TICKS))
+    assert emitted == []
+
+
+def test_alerts_only_reach_the_users_clients():
+    app, socketio = _make_server()
+    alice = socketio.test_client(app, auth={"user_id": "alice"})
+    alice_tab = socketio.test_client(app)
+    alice_tab.emit("authenticate", {"user_id": "alice"})
+    bob = socketio.test_client(app)
+    bob.emit("authenticate", {"user_id": "alice"})
+    bob.emit("authenticate", {"user_id": "bob"})  # switching leaves alice's room
+    snoop = socketio.test_client(app)
+    snoop.emit("get:subscriptions", {"user_id": "alice"})  # reads join nothing
+    clients = (alice, alice_tab, bob, snoop)
+    for client in clients:
+        client.get_received()
+
+    broadcast_alert(socketio, "alice", {"symbol": "NABIL", "alert_type": "price"})
+
+    def alerts(client):
+        return [m["args"][0] for m in client.get_received() if m["name"] == "alert:triggered"]
+
+    expected = [{
+        "user_id": "alice",
+        "alert": {"symbol": "NABIL", "alert_type": "price", "message": "NABIL price threshold crossed."},
+    }]
+    assert alerts(alice) == expected
+    assert alerts(alice_tab) == expected
+    assert alerts(bob) == []
+    assert alerts(snoop) == []
+    for client in clients:
+        client.disconnect()
+    assert handlers._client_users == {}
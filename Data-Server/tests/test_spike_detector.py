@@ -1,150 +1,150 @@
 """Tests for the deterministic spike detector."""
 
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from detection.spike_detector import SpikeDetector
-
+from types import MappingProxyType
+
+import numpy as np
+import pytest
+
+from detection.spike_detector import SpikeDetector, _scan_spikes
+
+TICK_FIELDS = ("symbol", "price", "prev_close", "volume", "avg_volume")
+
+# Read-only, so the shared ticks cannot leak state between tests
+SPIKE_TICK = MappingProxyType({
+    "symbol": "NABIL",
+    "price": 1320.0,
+    "prev_close": 1250.0,  # 5.6% spike
+    "volume": 120000,
+    "avg_volume": 45000,  # 2.67x volume spike
+})
+
+MIXED_TICKS = tuple(
+    MappingProxyType(dict(zip(TICK_FIELDS, row)))
+    for row in [
+        ("NABIL", 1320.0, 1250.0, 120000, 45000),  # price + volume
+        ("SCB", 1200.0, 1250.0, 1000, 45000),      # price down only
+        ("HDL", 1251.0, 1250.0, 90000, 40000),     # volume only
+        ("NICA", 1251.0, 1250.0, 1000, 40000),     # nothing
+        ("UPPER", 500.0, 0.0, 1000, 0),            # no references
+        ("NLIC", 1251.0, 0.0, 90000, 40000),       # volume only, zero prev_close
+        ("NHPC", 1320.0, 1250.0, 1000, 0),         # price only, zero avg_volume
+    ]
+)
 
-def test_price_spike_up():
-    """Price increase above threshold should trigger alert."""
-    detector = SpikeDetector(default_price_threshold_pct=3.0)
 
-    alert = detector.check_price_spike(
-        symbol="NABIL",
-        current_price=1300.0,
-        prev_close=1250.0,  # 4% increase
+@pytest.fixture(scope="module")
+def detector():
+    """One detector for the module; thresholds are fixed once configured."""
+    return SpikeDetector(
+        default_price_threshold_pct=3.0,
+        default_volume_threshold_multiplier=2.0,
     )
-    assert alert is not None, "Should detect 4% price spike"
-    assert alert.direction == "up"
-    assert alert.alert_type == "price"
-    assert alert.magnitude >= 3.0
-    print("  ✅ Price spike UP detected correctly")
-
 
-def test_price_spike_down():
-    """Price decrease above threshold should trigger alert."""
-    detector = SpikeDetector(default_price_threshold_pct=3.0)
 
+@pytest.mark.parametrize(
+    "current_price,prev_close,threshold_pct,direction",
+    [
+        (1300.0, 1250.0, None, "up"),    # +4% over the 3% default
+        (1200.0, 1250.0, None, "down"),  # -4%
+        (1260.0, 1250.0, None, None),    # 0.8% — below threshold
+        (1265.0, 1250.0, 1.0, "up"),     # 1.2% with a custom 1% threshold
+    ],
+)
+def test_price_spike(detector, current_price, prev_close, threshold_pct, direction):
+    """Price moves at or beyond the threshold alert in their direction."""
     alert = detector.check_price_spike(
         symbol="NABIL",
-        current_price=1200.0,
-        prev_close=1250.0,  # -4% decrease
+        current_price=current_price,
+        prev_close=prev_close,
+        threshold_pct=threshold_pct,
     )
-    assert alert is not None, "Should detect -4% price spike"
-    assert alert.direction == "down"
+    if direction is None:
+        assert alert is None, "Should NOT detect small price change"
+        return
+    assert alert is not None, "Should detect price spike"
+    assert alert.direction == direction
     assert alert.alert_type == "price"
-    print("  ✅ Price spike DOWN detected correctly")
-
-
-def test_no_price_spike():
-    """Price change below threshold should NOT trigger alert."""
-    detector = SpikeDetector(default_price_threshold_pct=3.0)
-
-    alert = detector.check_price_spike(
-        symbol="NABIL",
-        current_price=1260.0,
-        prev_close=1250.0,  # 0.8% — below threshold
-    )
-    assert alert is None, "Should NOT detect small price change"
-    print("  ✅ Small price change correctly ignored")
-
-
-def test_volume_spike():
-    """Volume above threshold multiplier should trigger alert."""
-    detector = SpikeDetector(default_volume_threshold_multiplier=2.0)
-
+    assert alert.magnitude >= alert.threshold
+
+
+@pytest.mark.parametrize(
+    "current_volume,avg_volume,expect_alert",
+    [
+        (100000, 40000, True),   # 2.5x average
+        (50000, 40000, False),   # 1.25x — below threshold
+    ],
+)
+def test_volume_spike(detector, current_volume, avg_volume, expect_alert):
+    """Volume at or above the threshold multiplier of average alerts."""
     alert = detector.check_volume_spike(
         symbol="NABIL",
-        current_volume=100000,
-        avg_volume=40000,  # 2.5x average
+        current_volume=current_volume,
+        avg_volume=avg_volume,
     )
-    assert alert is not None, "Should detect 2.5x volume spike"
+    if not expect_alert:
+        assert alert is None, "Should NOT detect normal volume"
+        return
+    assert alert is not None, "Should detect volume spike"
     assert alert.alert_type == "volume"
     assert alert.direction == "up"
-    print("  ✅ Volume spike detected correctly")
 
 
-def test_no_volume_spike():
-    """Volume below threshold should NOT trigger alert."""
-    detector = SpikeDetector(default_volume_threshold_multiplier=2.0)
+def test_analyze_tick(detector):
+    """Full tick analysis should check both price and volume."""
+    alerts = detector.analyze_tick(SPIKE_TICK)
+    assert len(alerts) == 2, f"Expected 2 alerts (price + volume), got {len(alerts)}"
+    types = {a.alert_type for a in alerts}
+    assert "price" in types and "volume" in types
+
 
-    alert = detector.check_volume_spike(
-        symbol="NABIL",
-        current_volume=50000,
-        avg_volume=40000,  # 1.25x — below threshold
+def test_scan_spikes_jit_warmup():
+    """Compile the batch kernel (when Numba is installed) before the batch tests."""
+    price_hit, volume_hit = _scan_spikes(
+        np.array([1320.0, 1251.0]),
+        np.array([1250.0, 0.0]),
+        np.array([120000.0, 1.0]),
+        np.array([45000.0, 0.0]),
+        3.0,
+        2.0,
     )
-    assert alert is None, "Should NOT detect normal volume"
-    print("  ✅ Normal volume correctly ignored")
+    assert price_hit.tolist() == [True, False]
+    assert volume_hit.tolist() == [True, False]
 
 
-def test_custom_thresholds():
-    """Custom thresholds should override defaults."""
-    detector = SpikeDetector(
-        default_price_threshold_pct=3.0,
-        default_volume_threshold_multiplier=2.0,
-    )
+def test_analyze_ticks_batch(detector):
+    """Batched analysis should flag every spiking row in a column batch."""
+    n = 10000
+    ticks = {key: np.full(n, SPIKE_TICK[key]) for key in TICK_FIELDS}
 
-    # Use a tighter threshold (1%)
-    alert = detector.check_price_spike(
-        symbol="NABIL",
-        current_price=1265.0,
-        prev_close=1250.0,  # 1.2% change
-        threshold_pct=1.0,  # Custom 1% threshold
-    )
-    assert alert is not None, "Should detect 1.2% spike with 1% threshold"
-    print("  ✅ Custom thresholds work correctly")
+    alerts = detector.analyze_ticks(ticks)
+    assert len(alerts) == 2 * n
+    assert [a.alert_type for a in alerts[:2]] == ["price", "volume"]
 
 
-def test_analyze_tick():
-    """Full tick analysis should check both price and volume."""
-    detector = SpikeDetector(
-        default_price_threshold_pct=3.0,
-        default_volume_threshold_multiplier=2.0,
-    )
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+def test_analyze_ticks_matches_analyze_tick(detector):
+    """Batched analysis should agree with the per-tick path row by row.
 
-    tick = {
-        "symbol": "NABIL",
-        "price": 1320.0,
-        "prev_close": 1250.0,  # 5.6% spike
-        "volume": 120000,
-        "avg_volume": 45000,  # 2.67x volume spike
-    }
+    Rows with a zero reference for the rule that did not fire must not be
+    divided by it (no divide-by-zero warning).
+    """
+    columns = {key: np.array([t[key] for t in MIXED_TICKS]) for key in TICK_FIELDS}
 
-    alerts = detector.analyze_tick(tick)
-    assert len(alerts) == 2, f"Expected 2 alerts (price + volume), got {len(alerts)}"
-    types = {a.alert_type for a in alerts}
-    assert "price" in types and "volume" in types
-    print("  ✅ Full tick analysis detects both price and volume spikes")
+    def fields(alert):
+        return (alert.symbol, alert.alert_type, alert.direction, alert.magnitude,
+                alert.current_value, alert.reference_value)
+
+    expected = [fields(a) for t in MIXED_TICKS for a in detector.analyze_tick(t)]
+    assert [fields(a) for a in detector.analyze_ticks(columns)] == expected
 
 
-def test_spike_alert_serialization():
+def test_spike_alert_serialization(detector):
     """SpikeAlert.to_dict() should produce a valid dict."""
-    detector = SpikeDetector()
     alert = detector.check_price_spike("NABIL", 1300.0, 1250.0)
     assert alert is not None
 
     d = alert.to_dict()
-    required_keys = [
+    assert d.keys() == {
         "symbol", "alert_type", "direction", "magnitude",
-        "current_value", "threshold", "reference_value", "timestamp",
-    ]
-    for key in required_keys:
-        assert key in d, f"Missing key in serialized alert: {key}"
-    print("  ✅ SpikeAlert serialization is correct")
-
-
-if __name__ == "__main__":
-    print("\n📊 Spike Detector Tests")
-    print("-" * 40)
-    test_price_spike_up()
-    test_price_spike_down()
-    test_no_price_spike()
-    test_volume_spike()
-    test_no_volume_spike()
-    test_custom_thresholds()
-    test_analyze_tick()
-    test_spike_alert_serialization()
-    print("\n✅ All spike detector tests passed!\n")
+        "current_value", "threshold", "reference_value", "timestamp", "message",
+    }
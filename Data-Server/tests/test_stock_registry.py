@@ -0,0 +1,76 @@
+"""Tests for the stock registry lookups used by the REST routes."""
+
+import threading
+
+from data import stock_registry
+from data.stock_registry import (
+    canonical_symbol,
+    get_all_symbols,
+    get_historical_columns,
+    get_historical_data,
+    get_stock_info,
+    search_stocks,
+)
+
+
+def test_search_matches_symbol_or_name():
+    results = search_stocks("nab")
+    symbols = [r["symbol"] for r in results]
+    assert "NABIL" in symbols
+    for r in results:
+        assert "NAB" in r["symbol"] or "NAB" in r["name"].upper()
+
+
+def test_search_sector_filter_is_substring():
+    results = search_stocks(sector="hydro", limit=1000)
+    assert results
+    assert all("hydro" in r["sector"].lower() for r in results)
+    assert [r["symbol"] for r in results] == sorted(r["symbol"] for r in results)
+
+
+def test_search_limit_and_no_match():
+    assert len(search_stocks()) == min(50, len(get_all_symbols()))
+    assert search_stocks("ZZZZZZ") == []
+
+
+def test_stock_info_returns_copies():
+    info = get_stock_info("nabil")
+    info["name"] = "changed"
+    assert get_stock_info("NABIL")["name"] != "changed"
+
+
+def test_canonical_symbol_folds_case_and_validates():
+    assert canonical_symbol("NABIL") == "NABIL"
+    assert canonical_symbol("nabil") == "NABIL"
+    assert canonical_symbol("NaBiL") == "NABIL"
+    assert canonical_symbol("NOT-A-STOCK") is None
+
+
+def test_historical_columns_match_records():
+    records = get_historical_data("NABIL", days=5)
+    columns = get_historical_columns("nabil", days=5)
+    assert len(records) == 5
+    assert {key: [r[key] for r in records] for key in records[0]} == columns
+
+
+def test_reads_during_first_load_wait_for_it(monkeypatch):
+    """A lookup racing the initial load should see the loaded registry."""
+    loading = threading.Event()
+    preload = stock_registry._preload_price_histories
+
+    def slow_preload():
+        loading.set()
+        threading.Event().wait(0.2)
+        preload()
+
+    stock_registry._clear_registry()
+    monkeypatch.setattr(stock_registry, "_initialized", False)
+    monkeypatch.setattr(stock_registry, "_preload_price_histories", slow_preload)
+    loader = threading.Thread(target=stock_registry._initialize)
+    loader.start()
+    loading.wait()
+    try:
+        assert [r["symbol"] for r in search_stocks("NABIL")][:1] == ["NABIL"]
+        assert get_stock_info("NABIL")["name"]
+    finally:
+        loader.join()
@@ -0,0 +1,90 @@
+"""JSON encoding with optional orjson support.
+
+``dumps`` returns UTF-8 encoded JSON bytes, using ``orjson`` when it is
+installed and the standard library otherwise. ``json_response`` and
+``FastJSONProvider`` put the same encoder behind Flask responses, and
+``SocketJSON`` behind Socket.IO packets.
+"""
+
+import json
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # type: ignore
+
+    ORJSON_ENABLED = True
+except ImportError:
+    orjson = None
+    ORJSON_ENABLED = False
+
+
+def dumps(obj) -> bytes:
+    """Serialize ``obj`` to compact JSON bytes."""
+    if ORJSON_ENABLED:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """Build an application/json response for ``obj`` (a faster ``jsonify``)."""
+    return Response(dumps(obj), status=status, mimetype="application/json")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when it is installed.
+
+    orjson output is always compact and keeps dict insertion order, so the
+    ``sort_keys`` and ``compact`` settings only apply to the stdlib fallback.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if ORJSON_ENABLED:
+            return self._encode(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if ORJSON_ENABLED:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs) -> Response:
+        if not ORJSON_ENABLED:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+    def _encode(self, obj) -> bytes:
+        # Swagger specs key responses by integer status code.
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RawJSON:
+    """Already-encoded JSON bytes to emit over Socket.IO without re-encoding."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class SocketJSON:
+    """``json`` module stand-in for Socket.IO packet encoding (``SocketIO(json=...)``).
+
+    A packet is encoded as its ``[event, *args]`` list; ``RawJSON`` args are
+    spliced in verbatim so a payload serialized once can be sent as-is.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        if isinstance(obj, list) and any(isinstance(item, RawJSON) for item in obj):
+            parts = [item.data if isinstance(item, RawJSON) else dumps(item) for item in obj]
+            return (b"[" + b",".join(parts) + b"]").decode()
+        return dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        if ORJSON_ENABLED:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
@@ -0,0 +1,22 @@
+"""Optional Numba JIT support.
+
+``njit`` compiles a numeric kernel with Numba when it is installed and is a
+no-op decorator otherwise, so the same kernels run as plain Python/NumPy.
+"""
+
+try:
+    from numba import njit as _numba_njit  # type: ignore
+
+    NUMBA_ENABLED = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_ENABLED = False
+
+
+def njit(*args, **kwargs):
+    """Drop-in for ``numba.njit`` that degrades to the undecorated function."""
+    if NUMBA_ENABLED:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
@@ -6,6 +6,7 @@
  */
 import React, { createContext, useCallback, useContext, useEffect, useRef, useState } from "react";
 import {
+    authenticate,
     connectSocket,
     disconnectSocket,
     getSocket,
@@ -371,6 +372,7 @@ export function DataServerProvider({ children }: { children: React.ReactNode })
         if (!socket.connected || !userId) {
             return;
         }
+        authenticate(userId);
         socket.emit("get:subscriptions", { user_id: userId });
     }, []);
 
@@ -60,6 +60,18 @@ export function unsubscribeStock(symbols: string[]): void {
     }
 }
 
+/**
+ * Bind this connection to a user so the server delivers that user's
+ * `alert:triggered` events. Re-sent before user-scoped requests, since the
+ * binding does not survive a reconnect.
+ */
+export function authenticate(userId: string): void {
+    const s = getSocket();
+    if (s.connected && userId) {
+        s.emit("authenticate", { user_id: userId });
+    }
+}
+
 export function setThreshold(data: {
     user_id: string;
     symbol: string;
@@ -68,6 +80,7 @@ export function setThreshold(data: {
 }): void {
     const s = getSocket();
     if (s.connected) {
+        authenticate(data.user_id);
         s.emit("set:threshold", data);
     }
 }